@@ -0,0 +1,86 @@
+"""scheduling, counters, rendered content, view buckets and outbox
+
+Online on MySQL: new columns are INSTANT, new indexes are built INPLACE with
+LOCK=NONE, and approved_comment_count is backfilled in throttled batches.
+content_html stays NULL for existing posts until ``python -m app.db.backfill``
+renders them; reads fall back to the raw content meanwhile.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:45:12.481093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import (
+    add_column_online, batched_backfill, create_index_online, drop_column_online, drop_index_online,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    add_column_online('posts', sa.Column('scheduled_at', sa.DateTime(), nullable=True))
+    add_column_online('posts', sa.Column('approved_comment_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    add_column_online('posts', sa.Column('content_html', sa.Text(), nullable=True))
+    add_column_online('posts', sa.Column('word_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    add_column_online('posts', sa.Column('reading_time_minutes', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+    create_index_online('ix_posts_is_published_scheduled_at', 'posts', ['is_published', 'scheduled_at'])
+    create_index_online('ix_comments_is_approved_created_at', 'comments', ['is_approved', 'created_at', 'id'])
+
+    op.create_table('post_view_buckets',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('hour', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name=op.f('fk_post_view_buckets_post_id_posts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'hour', name=op.f('pk_post_view_buckets'))
+    )
+    op.create_index('ix_post_view_buckets_hour_post_id', 'post_view_buckets', ['hour', 'post_id'], unique=False)
+
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('aggregate_type', sa.String(length=50), nullable=False),
+    sa.Column('aggregate_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=20), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_outbox_events'))
+    )
+    op.create_index('ix_outbox_events_next_attempt_at_id', 'outbox_events', ['next_attempt_at', 'id'], unique=False)
+
+    batched_backfill(
+        'posts',
+        'approved_comment_count = (SELECT COUNT(*) FROM comments '
+        'WHERE comments.post_id = posts.id AND comments.is_approved = 1)',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_next_attempt_at_id', table_name='outbox_events')
+    op.drop_table('outbox_events')
+
+    op.drop_index('ix_post_view_buckets_hour_post_id', table_name='post_view_buckets')
+    op.drop_table('post_view_buckets')
+
+    drop_index_online('ix_comments_is_approved_created_at', 'comments')
+    drop_index_online('ix_posts_is_published_scheduled_at', 'posts')
+
+    drop_column_online('posts', 'reading_time_minutes')
+    drop_column_online('posts', 'word_count')
+    drop_column_online('posts', 'content_html')
+    drop_column_online('posts', 'approved_comment_count')
+    drop_column_online('posts', 'scheduled_at')
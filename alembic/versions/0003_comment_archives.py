@@ -0,0 +1,42 @@
+"""comment archives
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:20:41.902215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('comment_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('first_comment_id', sa.Integer(), nullable=False),
+    sa.Column('last_comment_id', sa.Integer(), nullable=False),
+    sa.Column('comment_count', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(length=16777215), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name=op.f('fk_comment_archives_post_id_posts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_comment_archives'))
+    )
+    op.create_index('ix_comment_archives_first_comment_id_last_comment_id', 'comment_archives', ['first_comment_id', 'last_comment_id'], unique=False)
+    op.create_index(op.f('ix_comment_archives_post_id'), 'comment_archives', ['post_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_comment_archives_post_id'), table_name='comment_archives')
+    op.drop_index('ix_comment_archives_first_comment_id_last_comment_id', table_name='comment_archives')
+    op.drop_table('comment_archives')
@@ -0,0 +1,27 @@
+"""index for the newest-first feed of published posts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 16:20:44.502118
+
+"""
+from typing import Sequence, Union
+
+from app.db.migrations import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_online('ix_posts_is_published_published_at', 'posts', ['is_published', 'published_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_online('ix_posts_is_published_published_at', 'posts')
@@ -0,0 +1,50 @@
+"""user stats
+
+Seeded from posts in one INSERT ... SELECT; writes that race with the
+migration are corrected by the user stats reconciler.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 17:05:31.927204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('published_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('draft_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total_views', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_user_stats_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', name=op.f('pk_user_stats'))
+    )
+    op.execute(
+        "INSERT INTO user_stats "
+        "(user_id, post_count, published_count, draft_count, total_views, comment_count) "
+        "SELECT author_id, COUNT(*), "
+        "SUM(CASE WHEN is_published THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN is_published THEN 0 ELSE 1 END), "
+        "SUM(view_count), SUM(approved_comment_count) "
+        "FROM posts GROUP BY author_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
@@ -0,0 +1,35 @@
+"""soft delete: deleted_at on users, posts and comments
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 19:03:47.215880
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from app.db.migrations import add_column_online, create_index_online, drop_column_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'posts', 'comments')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        add_column_online(table, sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        create_index_online(f'ix_{table}_deleted_at', table, ['deleted_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        drop_index_online(f'ix_{table}_deleted_at', table)
+        drop_column_online(table, 'deleted_at')
@@ -0,0 +1,62 @@
+"""comment archive authors
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 21:12:08.530417
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    authors = op.create_table('comment_archive_authors',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('archive_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['archive_id'], ['comment_archives.id'], name=op.f('fk_comment_archive_authors_archive_id_comment_archives'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], name=op.f('fk_comment_archive_authors_author_id_users')),
+    sa.PrimaryKeyConstraint('author_id', 'archive_id', name=op.f('pk_comment_archive_authors'))
+    )
+    op.create_index(op.f('ix_comment_archive_authors_archive_id'), 'comment_archive_authors', ['archive_id'], unique=False)
+
+    # Index the authors of the chunks archived so far, a batch of chunks at a time
+    archives = sa.table('comment_archives', sa.column('id', sa.Integer), sa.column('data', sa.LargeBinary))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(archives.c.id, archives.c.data)
+            .where(archives.c.id > last_id)
+            .order_by(archives.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        entries = [
+            {'author_id': author_id, 'archive_id': archive_id}
+            for archive_id, data in rows
+            for author_id in sorted({comment['author_id'] for comment in json.loads(zlib.decompress(data))})
+        ]
+        if entries:
+            op.bulk_insert(authors, entries)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_comment_archive_authors_archive_id'), table_name='comment_archive_authors')
+    op.drop_table('comment_archive_authors')
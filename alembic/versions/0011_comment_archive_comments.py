@@ -0,0 +1,65 @@
+"""comment archive comments
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 23:40:51.118204
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    comments = op.create_table('comment_archive_comments',
+    sa.Column('comment_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('archive_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['archive_id'], ['comment_archives.id'], name=op.f('fk_comment_archive_comments_archive_id_comment_archives'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('comment_id', name=op.f('pk_comment_archive_comments'))
+    )
+    op.create_index(op.f('ix_comment_archive_comments_archive_id'), 'comment_archive_comments', ['archive_id'], unique=False)
+
+    # Index the comments of the chunks archived so far, a batch of chunks at a time
+    archives = sa.table('comment_archives', sa.column('id', sa.Integer), sa.column('data', sa.LargeBinary))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(archives.c.id, archives.c.data)
+            .where(archives.c.id > last_id)
+            .order_by(archives.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        entries = [
+            {'comment_id': comment['id'], 'archive_id': archive_id}
+            for archive_id, data in rows
+            for comment in json.loads(zlib.decompress(data))
+        ]
+        if entries:
+            op.bulk_insert(comments, entries)
+        last_id = rows[-1].id
+
+    # Single comments are looked up through comment_archive_comments now
+    op.drop_index('ix_comment_archives_first_comment_id_last_comment_id', table_name='comment_archives')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_comment_archives_first_comment_id_last_comment_id', 'comment_archives', ['first_comment_id', 'last_comment_id'], unique=False)
+    op.drop_index(op.f('ix_comment_archive_comments_archive_id'), table_name='comment_archive_comments')
+    op.drop_table('comment_archive_comments')
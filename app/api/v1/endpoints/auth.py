@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
+from app.core.security import create_access_token
+from app.crud import user as crud_user
+from app.schemas.token import Token
+from app.utils.exceptions import UnauthorizedException, ForbiddenException
+
+router = APIRouter()
+
+
+@router.post("/token", response_model=Token)
+async def login_for_access_token(
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        db: AsyncSession = Depends(get_db)
+):
+    """Exchange username (or email) and password for an access token"""
+    user = await crud_user.authenticate(db=db, username=form_data.username, password=form_data.password)
+    if not user:
+        raise UnauthorizedException(detail="Incorrect username or password")
+    if not user.is_active:
+        raise ForbiddenException(detail="Inactive user")
+    return Token(access_token=create_access_token(user.id))
@@ -1,10 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.db.session import get_db
-from app.crud import comment as crud_comment, user as crud_user, post as crud_post
-from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
+from app.core.idempotency import run_idempotent
+from app.crud import comment as crud_comment, comment_archive as crud_comment_archive, post as crud_post
+from app.dependencies import get_current_user, get_current_superuser
+from app.schemas.comment import (
+    CommentCreate, CommentUpdate, CommentResponse, CommentPage, CommentModerate, CommentModerateResult,
+)
+from app.schemas.user import UserResponse
 from app.utils.exceptions import NotFoundException, BadRequestException
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
@@ -12,22 +19,33 @@ router = APIRouter()
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
         comment_in: CommentCreate,
-        author_id: int = Query(..., description="Author user ID"),
+        current_user: UserResponse = Depends(get_current_user),
+        idempotency_key: Optional[str] = Header(None, max_length=255),
         db: AsyncSession = Depends(get_db)
 ):
-    """Create a new comment"""
-    # Verify author exists
-    author = await crud_user.get(db=db, id=author_id)
-    if not author:
-        raise BadRequestException(detail="Author not found")
-
-    # Verify post exists
-    post = await crud_post.get(db=db, id=comment_in.post_id)
-    if not post:
-        raise BadRequestException(detail="Post not found")
-
-    comment = await crud_comment.create_with_author(db=db, obj_in=comment_in, author_id=author_id)
-    return comment
+    """Create a new comment; retries with the same Idempotency-Key get the first response"""
+    async def create(commit: bool = True):
+        # Verify post exists
+        post = await crud_post.get(db=db, id=comment_in.post_id)
+        if not post:
+            raise BadRequestException(detail="Post not found")
+        if comment_in.parent_id is not None:
+            # Replying to an archived thread brings it back into the hot table
+            parent = await crud_comment.get_or_restore(db=db, id=comment_in.parent_id)
+            if not parent:
+                raise BadRequestException(detail="Parent comment not found")
+
+        return await crud_comment.create_with_author(
+            db=db, obj_in=comment_in, author_id=current_user.id, commit=commit
+        )
+
+    if idempotency_key is None:
+        return await create()
+    return await run_idempotent(
+        db=db, user_id=current_user.id, key=idempotency_key, scope="POST /comments/",
+        payload=comment_in.model_dump(mode="json"), execute=create,
+        response_model=CommentResponse, status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.get("/", response_model=List[CommentResponse])
@@ -53,6 +71,38 @@ async def read_comments_by_post(
     return comments
 
 
+@router.get("/pending", response_model=CommentPage)
+async def read_pending_comments(
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=500),
+        current_user: UserResponse = Depends(get_current_superuser),
+        db: AsyncSession = Depends(get_db)
+):
+    """Moderation queue: unapproved comments, oldest first"""
+    after = decode_cursor(cursor) if cursor else None
+    comments = await crud_comment.get_pending(db=db, after=after, limit=limit)
+    next_cursor = None
+    if len(comments) == limit:
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    return CommentPage(items=comments, next_cursor=next_cursor)
+
+
+@router.post("/moderate", response_model=CommentModerateResult)
+async def moderate_comments(
+        moderation_in: CommentModerate,
+        current_user: UserResponse = Depends(get_current_superuser),
+        db: AsyncSession = Depends(get_db)
+):
+    """Approve or reject many comments at once"""
+    affected = await crud_comment.moderate(
+        db=db,
+        ids=moderation_in.ids,
+        action=moderation_in.action,
+        batch_size=settings.MODERATION_BATCH_SIZE,
+    )
+    return CommentModerateResult(action=moderation_in.action, affected=affected)
+
+
 @router.get("/{comment_id}", response_model=CommentResponse)
 async def read_comment(
         comment_id: int,
@@ -60,6 +110,8 @@ async def read_comment(
 ):
     """Get comment by ID"""
     comment = await crud_comment.get(db=db, id=comment_id)
+    if not comment:
+        comment = await crud_comment_archive.get_comment(db=db, id=comment_id)
     if not comment:
         raise NotFoundException(detail="Comment not found")
     return comment
@@ -72,7 +124,7 @@ async def update_comment(
         db: AsyncSession = Depends(get_db)
 ):
     """Update a comment"""
-    comment = await crud_comment.get(db=db, id=comment_id)
+    comment = await crud_comment.get_or_restore(db=db, id=comment_id)
     if not comment:
         raise NotFoundException(detail="Comment not found")
 
@@ -0,0 +1,95 @@
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, Hashable, Optional
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core import feeds
+from app.db.session import get_db
+from app.utils.exceptions import NotFoundException
+
+router = APIRouter()
+
+SITEMAP_MEDIA_TYPE = "application/xml"
+RSS_MEDIA_TYPE = "application/rss+xml"
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Conditional GET: If-None-Match wins over If-Modified-Since when both are sent"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since.replace(tzinfo=None)
+
+
+def serve_document(
+        request: Request,
+        key: Hashable,
+        version: Hashable,
+        last_modified: Optional[datetime],
+        media_type: str,
+        build: Callable[[], AsyncIterator[str]],
+) -> Response:
+    etag = feeds.make_etag(version)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.FEED_MAX_AGE_SECONDS}"}
+    if last_modified is not None:
+        headers["Last-Modified"] = feeds.http_datetime(last_modified)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = feeds.get_cached_document(key, version)
+    if cached is not None:
+        return Response(content=cached, media_type=media_type, headers=headers)
+    return StreamingResponse(feeds.stream_and_cache(key, version, build()), media_type=media_type, headers=headers)
+
+
+@router.get("/sitemap.xml")
+async def read_sitemap(request: Request, db: AsyncSession = Depends(get_db)):
+    """All published posts, or a sitemap index of id-range shards past SITEMAP_SHARD_SIZE posts"""
+    last_modified, count = await feeds.published_version(db)
+    if count <= settings.SITEMAP_SHARD_SIZE:
+        return serve_document(
+            request, ("sitemap",), (last_modified, count), last_modified, SITEMAP_MEDIA_TYPE,
+            lambda: feeds.sitemap_urlset(db),
+        )
+
+    shards = await feeds.sitemap_shards(db)
+
+    async def build_index() -> AsyncIterator[str]:
+        yield feeds.sitemap_index(shards)
+
+    return serve_document(
+        request, ("sitemap-index",), tuple(shards), last_modified, SITEMAP_MEDIA_TYPE, build_index,
+    )
+
+
+@router.get("/sitemaps/posts-{shard}.xml")
+async def read_sitemap_shard(shard: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """One shard of the sitemap index: published posts with ids in [shard * size, (shard + 1) * size)"""
+    found = next((entry for entry in await feeds.sitemap_shards(db) if entry[0] == shard), None)
+    if found is None:
+        raise NotFoundException(detail="Sitemap not found")
+    _, last_modified, count = found
+    size = settings.SITEMAP_SHARD_SIZE
+    return serve_document(
+        request, ("sitemap", size, shard), (last_modified, count), last_modified, SITEMAP_MEDIA_TYPE,
+        lambda: feeds.sitemap_urlset(db, start_id=shard * size, end_id=(shard + 1) * size),
+    )
+
+
+@router.get("/feed.xml")
+async def read_feed(request: Request, db: AsyncSession = Depends(get_db)):
+    """RSS 2.0 feed of the latest FEED_SIZE published posts"""
+    last_modified, count = await feeds.published_version(db)
+    return serve_document(
+        request, ("feed", settings.FEED_SIZE), (last_modified, count), last_modified, RSS_MEDIA_TYPE,
+        lambda: feeds.rss_feed(db, last_modified),
+    )
@@ -1,32 +1,62 @@
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.db.session import get_db
-from app.crud import post as crud_post, user as crud_user
-from app.schemas.post import PostCreate, PostUpdate, PostResponse
+from app.core.idempotency import run_idempotent
+from app.core.trending import trending_store, view_buffer
+from app.crud import post as crud_post, post_revision as crud_post_revision, tag as crud_tag
+from app.crud.crud_tag import parse_tag_list
+from app.dependencies import get_current_user
+from app.schemas.post import PostCreate, PostUpdate, PostResponse, PostRevisionSummary, PostRevisionResponse
+from app.schemas.user import UserResponse
+from app.utils.cache import invalidate_group
 from app.utils.exceptions import NotFoundException, BadRequestException
+from app.workers.trending import refresh_trending
 
 router = APIRouter()
 
+ContentFormat = Literal["markdown", "html"]
+
+
+def with_content_format(post, format: ContentFormat):
+    """Serve the pre-rendered HTML in ``content`` when asked for, without rendering per read"""
+    if format == "markdown":
+        return post
+    response = PostResponse.model_validate(post)
+    return response.model_copy(update={"content": post.content_html or post.content})
+
 
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
         post_in: PostCreate,
-        author_id: int = Query(..., description="Author user ID"),
+        current_user: UserResponse = Depends(get_current_user),
+        idempotency_key: Optional[str] = Header(None, max_length=255),
         db: AsyncSession = Depends(get_db)
 ):
-    """Create a new post"""
-    # Verify author exists
-    author = await crud_user.get(db=db, id=author_id)
-    if not author:
-        raise BadRequestException(detail="Author not found")
-
-    # Check if slug exists
-    existing = await crud_post.get_by_slug(db=db, slug=post_in.slug)
-    if existing:
-        raise BadRequestException(detail="Post with this slug already exists")
-
-    post = await crud_post.create_with_author(db=db, obj_in=post_in, author_id=author_id)
+    """Create a new post; retries with the same Idempotency-Key get the first response"""
+    async def create(commit: bool = True):
+        # Check if slug exists
+        existing = await crud_post.get_by_slug(db=db, slug=post_in.slug, include_deleted=True)
+        if existing:
+            raise BadRequestException(detail="Post with this slug already exists")
+
+        return await crud_post.create_with_author(
+            db=db, obj_in=post_in, author_id=current_user.id, commit=commit
+        )
+
+    if idempotency_key is None:
+        post = await create()
+    else:
+        post = await run_idempotent(
+            db=db, user_id=current_user.id, key=idempotency_key, scope="POST /posts/",
+            payload=post_in.model_dump(mode="json"), execute=create,
+            response_model=PostResponse, status_code=status.HTTP_201_CREATED,
+        )
+    # After the commit, so a concurrent reader can't cache the state before it
+    invalidate_group("posts")
+    invalidate_group("tags")
     return post
 
 
@@ -35,19 +65,48 @@ async def read_posts(
         skip: int = 0,
         limit: int = 100,
         published_only: bool = False,
+        tags: Optional[str] = Query(None, description="Comma-separated tag slugs"),
+        tags_match: Literal["all", "any"] = "all",
+        format: ContentFormat = "markdown",
         db: AsyncSession = Depends(get_db)
 ):
-    """Retrieve all posts"""
-    if published_only:
+    """Retrieve all posts, optionally only those tagged with all (AND) or any (OR) of ``tags``"""
+    if tags is not None:
+        slugs = parse_tag_list(tags)
+        found = await crud_tag.get_by_slugs(db=db, slugs=slugs)
+        if not found or (tags_match == "all" and len(found) < len(slugs)):
+            return []
+        posts = await crud_post.get_by_tags(
+            db=db, tag_ids=[t.id for t in found], match=tags_match,
+            published_only=published_only, skip=skip, limit=limit,
+        )
+    elif published_only:
         posts = await crud_post.get_published(db=db, skip=skip, limit=limit)
     else:
         posts = await crud_post.get_multi_with_author(db=db, skip=skip, limit=limit)
-    return posts
+    return [with_content_format(post, format) for post in posts]
+
+
+@router.get("/trending", response_model=List[PostResponse])
+async def read_trending_posts(
+        window: Literal["24h", "7d"] = "24h",
+        limit: int = Query(10, ge=1, le=settings.TRENDING_TOP_K),
+        db: AsyncSession = Depends(get_db)
+):
+    """Most viewed published posts in the given window"""
+    top = trending_store.get(window)
+    if top is None:
+        # First request before the aggregator's first tick
+        await refresh_trending(db, datetime.utcnow())
+        top = trending_store.get(window)
+
+    return await crud_post.get_multi_by_ids(db=db, ids=[post_id for post_id, _ in top[:limit]])
 
 
 @router.get("/{post_id}", response_model=PostResponse)
 async def read_post(
         post_id: int,
+        format: ContentFormat = "markdown",
         db: AsyncSession = Depends(get_db)
 ):
     """Get post by ID"""
@@ -55,14 +114,16 @@ async def read_post(
     if not post:
         raise NotFoundException(detail="Post not found")
 
-    # Increment view count
+    # Increment view count; the author's total_views follows in the view flush
     await crud_post.increment_view_count(db=db, id=post_id)
-    return post
+    view_buffer.record(post_id)
+    return with_content_format(post, format)
 
 
 @router.get("/slug/{slug}", response_model=PostResponse)
 async def read_post_by_slug(
         slug: str,
+        format: ContentFormat = "markdown",
         db: AsyncSession = Depends(get_db)
 ):
     """Get post by slug"""
@@ -70,9 +131,10 @@ async def read_post_by_slug(
     if not post:
         raise NotFoundException(detail="Post not found")
 
-    # Increment view count
+    # Increment view count; the author's total_views follows in the view flush
     await crud_post.increment_view_count(db=db, id=post.id)
-    return post
+    view_buffer.record(post.id)
+    return with_content_format(post, format)
 
 
 @router.put("/{post_id}", response_model=PostResponse)
@@ -88,14 +150,43 @@ async def update_post(
 
     # Check slug uniqueness if being updated
     if post_in.slug and post_in.slug != post.slug:
-        existing = await crud_post.get_by_slug(db=db, slug=post_in.slug)
+        existing = await crud_post.get_by_slug(db=db, slug=post_in.slug, include_deleted=True)
         if existing:
             raise BadRequestException(detail="Post with this slug already exists")
 
     post = await crud_post.update(db=db, id=post_id, obj_in=post_in)
+    invalidate_group("posts")
+    invalidate_group("tags")
     return post
 
 
+@router.get("/{post_id}/revisions", response_model=List[PostRevisionSummary])
+async def read_post_revisions(
+        post_id: int,
+        skip: int = 0,
+        limit: int = Query(100, ge=1, le=500),
+        db: AsyncSession = Depends(get_db)
+):
+    """List saved revisions of a post, newest first"""
+    post = await crud_post.get(db=db, id=post_id)
+    if not post:
+        raise NotFoundException(detail="Post not found")
+    return await crud_post_revision.get_multi_by_post(db=db, post_id=post_id, skip=skip, limit=limit)
+
+
+@router.get("/{post_id}/revisions/{revision}", response_model=PostRevisionResponse)
+async def read_post_revision(
+        post_id: int,
+        revision: int,
+        db: AsyncSession = Depends(get_db)
+):
+    """Get the title, content and excerpt of a post as of one revision"""
+    version = await crud_post_revision.get_version(db=db, post_id=post_id, revision=revision)
+    if not version:
+        raise NotFoundException(detail="Revision not found")
+    return version
+
+
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(
         post_id: int,
@@ -105,4 +196,6 @@ async def delete_post(
     post = await crud_post.delete(db=db, id=post_id)
     if not post:
         raise NotFoundException(detail="Post not found")
+    invalidate_group("posts")
+    invalidate_group("tags")
     return None
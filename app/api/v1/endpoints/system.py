@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
+from app.core.events import dispatch_metrics, get_sinks
+from app.core.profiling import FORMATS, profile_store
+from app.crud import outbox as crud_outbox
+from app.crud.base import read_flight
+from app.dependencies import get_current_superuser
+from app.utils.exceptions import NotFoundException
+
+router = APIRouter(dependencies=[Depends(get_current_superuser)])
+
+
+@router.get("/outbox")
+async def read_outbox_metrics(db: AsyncSession = Depends(get_db)):
+    """Outbox backlog, lag and this worker's dispatch throughput"""
+    pending, oldest = await crud_outbox.get_backlog(db=db)
+    lag_seconds = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    return {
+        "pending": pending,
+        "lag_seconds": max(lag_seconds, 0.0),
+        "sinks": [sink.name for sink in get_sinks()],
+        **dispatch_metrics.snapshot(),
+    }
+
+
+@router.get("/singleflight")
+async def read_singleflight_metrics():
+    """Hot reads this worker executed, and how many callers were coalesced onto them"""
+    return read_flight.snapshot()
+
+
+@router.get("/profiles")
+async def read_profiles():
+    """Request profiles kept by this worker's profiling middleware, newest first"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}")
+async def read_profile(profile_id: str, format: Literal["txt", "prof", "html"] = "txt"):
+    """Download one profile: a text report, a pstats dump (cProfile) or an HTML call tree (pyinstrument)"""
+    path = profile_store.file_path(profile_id, format)
+    if path is None:
+        raise NotFoundException(detail="Profile not found")
+    return FileResponse(path, media_type=FORMATS[format], filename=f"{profile_id}.{format}")
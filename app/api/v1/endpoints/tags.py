@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
+from app.crud import tag as crud_tag
+from app.schemas.tag import TagCloud
+
+router = APIRouter()
+
+
+@router.get("/cloud", response_model=TagCloud)
+async def read_tag_cloud(
+        limit: int = Query(100, ge=1, le=500),
+        db: AsyncSession = Depends(get_db)
+):
+    """Most used tags with their number of published posts"""
+    return TagCloud(items=await crud_tag.get_cloud(db=db, limit=limit))
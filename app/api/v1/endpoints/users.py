@@ -2,8 +2,9 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.crud import user as crud_user
-from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.crud import user as crud_user, user_stats as crud_user_stats
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserStatsResponse
+from app.utils.cache import invalidate_group
 from app.utils.exceptions import NotFoundException, BadRequestException
 
 router = APIRouter()
@@ -16,12 +17,12 @@ async def create_user(
 ):
     """Create a new user"""
     # Check if email exists
-    existing_user = await crud_user.get_by_email(db=db, email=user_in.email)
+    existing_user = await crud_user.get_by_email(db=db, email=user_in.email, include_deleted=True)
     if existing_user:
         raise BadRequestException(detail="Email already registered")
 
     # Check if username exists
-    existing_user = await crud_user.get_by_username(db=db, username=user_in.username)
+    existing_user = await crud_user.get_by_username(db=db, username=user_in.username, include_deleted=True)
     if existing_user:
         raise BadRequestException(detail="Username already taken")
 
@@ -52,6 +53,19 @@ async def read_user(
     return user
 
 
+@router.get("/{user_id}/stats", response_model=UserStatsResponse)
+async def read_user_stats(
+        user_id: int,
+        db: AsyncSession = Depends(get_db)
+):
+    """Post, view and comment totals of an author, read from the user_stats summary table"""
+    user = await crud_user.get(db=db, id=user_id)
+    if not user:
+        raise NotFoundException(detail="User not found")
+    stats = await crud_user_stats.get(db=db, user_id=user_id)
+    return stats if stats is not None else UserStatsResponse(user_id=user_id)
+
+
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
         user_id: int,
@@ -65,13 +79,13 @@ async def update_user(
 
     # Check email uniqueness if being updated
     if user_in.email and user_in.email != user.email:
-        existing_user = await crud_user.get_by_email(db=db, email=user_in.email)
+        existing_user = await crud_user.get_by_email(db=db, email=user_in.email, include_deleted=True)
         if existing_user:
             raise BadRequestException(detail="Email already registered")
 
     # Check username uniqueness if being updated
     if user_in.username and user_in.username != user.username:
-        existing_user = await crud_user.get_by_username(db=db, username=user_in.username)
+        existing_user = await crud_user.get_by_username(db=db, username=user_in.username, include_deleted=True)
         if existing_user:
             raise BadRequestException(detail="Username already taken")
 
@@ -88,4 +102,7 @@ async def delete_user(
     user = await crud_user.delete(db=db, id=user_id)
     if not user:
         raise NotFoundException(detail="User not found")
+    # Their posts went with them
+    invalidate_group("posts")
+    invalidate_group("tags")
     return None
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -7,10 +8,143 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_PREFIX: str = "/api/v1"
     DEBUG: bool = True
+    # Serve /openapi.json, /docs and /redoc; defaults to DEBUG so production skips them
+    OPENAPI_ENABLED: Optional[bool] = None
+    # Upper bound for importing app.main (including app construction), checked by tests/test_startup.py
+    STARTUP_BUDGET_SECONDS: float = 3.0
 
     # Database
     DATABASE_URL: str
     DATABASE_URL_SYNC: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_MAX_QUEUE: int = 50
+    DB_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    # Total connections all worker processes may hold (MySQL max_connections minus headroom);
+    # when set, each process gets an equal share instead of DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DB_CONNECTION_BUDGET: Optional[int] = None
+    # Database for the test suite; in-memory SQLite by default, or a MySQL URL to test against MySQL
+    TEST_DATABASE_URL: str = "sqlite+aiosqlite://"
+
+    # Server (main.py)
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: Optional[int] = None  # defaults to the number of usable CPU cores
+    WEB_KEEPALIVE_SECONDS: int = 5
+    WEB_BACKLOG: int = 2048
+
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_READ_RATE: float = 20.0
+    RATE_LIMIT_READ_BURST: int = 100
+    RATE_LIMIT_WRITE_RATE: float = 2.0
+    RATE_LIMIT_WRITE_BURST: int = 20
+    RATE_LIMIT_AUTH_RATE: float = 0.2
+    RATE_LIMIT_AUTH_BURST: int = 5
+    RATE_LIMIT_OFFSET_COST_STEP: int = 1000
+
+    # Authentication
+    SECRET_KEY: str
+    JWT_ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    USER_CACHE_TTL_SECONDS: float = 30.0
+
+    # Password hashing
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+
+    # Content rendering
+    RENDER_INLINE_MAX_CHARS: int = 20000
+    RENDER_MAX_WORKERS: int = 2
+
+    # Post revisions: a full snapshot every N revisions, deltas in between
+    POST_REVISION_SNAPSHOT_INTERVAL: int = 10
+
+    # Sitemap and feed
+    SITE_URL: str = "http://localhost:8000"
+    SITEMAP_SHARD_SIZE: int = 50000
+    SITEMAP_BATCH_SIZE: int = 1000
+    SITEMAP_CACHE_DOCUMENTS: int = 32
+    FEED_SIZE: int = 50
+    FEED_CHECK_SECONDS: float = 10.0
+    FEED_MAX_AGE_SECONDS: int = 300
+
+    # Request coalescing: concurrent identical hot reads in a worker share one query
+    SINGLEFLIGHT_ENABLED: bool = True
+    SINGLEFLIGHT_MAX_KEYS: int = 1024
+
+    # Idempotency-Key on POST /posts/ and /comments/: first response kept for the TTL,
+    # duplicates arriving while it runs wait up to IDEMPOTENCY_WAIT_SECONDS
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_POLL_SECONDS: float = 0.1
+    # An in-progress key older than this is treated as abandoned (its worker died)
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_PURGE_ENABLED: bool = True
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 600.0
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+
+    # Request profiling: the middleware is only installed when enabled. Superusers flag a
+    # request with PROFILING_HEADER; PROFILING_SAMPLE_RATE profiles a fraction of all requests
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_HEADER: str = "X-Profile"
+    # "auto" uses pyinstrument (async-aware call tree) when installed, cProfile otherwise
+    PROFILING_BACKEND: Literal["auto", "cprofile", "pyinstrument"] = "auto"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_PROFILES: int = 50
+    PROFILING_TOP_FUNCTIONS: int = 60
+
+    # Tags
+    TAG_CLOUD_CACHE_TTL_SECONDS: float = 60.0
+
+    # Comment moderation
+    MODERATION_BATCH_SIZE: int = 500
+
+    # Outbox (content change events); off by default, since capture costs every write an
+    # insert. Enable it together with a sink: without one the dispatcher isn't started
+    OUTBOX_ENABLED: bool = False
+    OUTBOX_DISPATCH_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_LEASE_SECONDS: int = 60
+    OUTBOX_RETRY_BASE_SECONDS: float = 1.0
+    OUTBOX_RETRY_MAX_SECONDS: float = 300.0
+    OUTBOX_WEBHOOK_URL: Optional[str] = None
+    OUTBOX_FILE_PATH: Optional[str] = None
+
+    # Background workers
+    SCHEDULED_PUBLISHING_ENABLED: bool = True
+    PUBLISHER_INTERVAL_SECONDS: float = 30.0
+    PUBLISHER_BATCH_SIZE: int = 100
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0
+    TRENDING_REFRESH_SECONDS: float = 60.0
+    TRENDING_TOP_K: int = 50
+    VIEW_BUCKET_RETENTION_DAYS: int = 8
+
+    # Comment archival: threads with no activity for this long move to comment_archives
+    COMMENT_ARCHIVE_ENABLED: bool = True
+    COMMENT_ARCHIVE_AFTER_DAYS: int = 180
+    COMMENT_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    COMMENT_ARCHIVE_BATCH_SIZE: int = 50
+    COMMENT_ARCHIVE_CHUNK_SIZE: int = 500
+    COMMENT_ARCHIVE_PAUSE_SECONDS: float = 0.2
+
+    # Soft delete: deleted users/posts/comments are hidden at once and purged in batches,
+    # children first, once they have been deleted for SOFT_DELETE_PURGE_AFTER_SECONDS
+    SOFT_DELETE_PURGE_ENABLED: bool = True
+    SOFT_DELETE_PURGE_AFTER_SECONDS: int = 0
+    SOFT_DELETE_PURGE_INTERVAL_SECONDS: float = 60.0
+    SOFT_DELETE_PURGE_BATCH_SIZE: int = 500
+    SOFT_DELETE_PURGE_PAUSE_SECONDS: float = 0.1
+
+    # Author stats: user_stats is updated on every write; the reconciler recomputes it to fix drift
+    USER_STATS_RECONCILE_ENABLED: bool = True
+    USER_STATS_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    USER_STATS_RECONCILE_BATCH_SIZE: int = 500
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,120 @@
+"""
+Outbox event sinks and dispatch metrics
+"""
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.config import settings
+
+Event = Dict[str, Any]
+
+
+class EventSink(ABC):
+    """Destination for outbox events; ``send`` must raise if delivery failed"""
+
+    name = "sink"
+
+    @abstractmethod
+    async def send(self, events: List[Event]) -> None:
+        """Deliver a batch of events"""
+
+    async def close(self) -> None:
+        pass
+
+
+class CallbackSink(EventSink):
+    """Calls an in-process async function with each batch"""
+
+    name = "callback"
+
+    def __init__(self, callback: Callable[[List[Event]], Awaitable[None]]):
+        self.callback = callback
+
+    async def send(self, events: List[Event]) -> None:
+        await self.callback(events)
+
+
+class WebhookSink(EventSink):
+    """POSTs each batch as JSON; any non-2xx response is a failure"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        # Imported here so processes without a webhook sink don't pay for httpx at startup
+        import httpx
+        self.url = url
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def send(self, events: List[Event]) -> None:
+        response = await self._client.post(self.url, json={"events": events})
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class FileSink(EventSink):
+    """Appends events as JSON lines to a local file"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def send(self, events: List[Event]) -> None:
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in events)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+@dataclass
+class DispatchMetrics:
+    dispatched_total: int = 0
+    failed_total: int = 0
+    last_batch_size: int = 0
+    last_batch_seconds: float = 0.0
+    last_dispatch_at: Optional[float] = None
+    started_at: float = field(default_factory=time.monotonic)
+
+    def record_batch(self, dispatched: int, failed: int, seconds: float) -> None:
+        self.dispatched_total += dispatched
+        self.failed_total += failed
+        self.last_batch_size = dispatched + failed
+        self.last_batch_seconds = seconds
+        self.last_dispatch_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "dispatched_total": self.dispatched_total,
+            "failed_total": self.failed_total,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_seconds": round(self.last_batch_seconds, 4),
+            "throughput_per_second": round(self.dispatched_total / uptime, 3),
+        }
+
+
+_sinks: List[EventSink] = []
+dispatch_metrics = DispatchMetrics()
+
+
+def register_sink(sink: EventSink) -> None:
+    _sinks.append(sink)
+
+
+def get_sinks() -> List[EventSink]:
+    return list(_sinks)
+
+
+def configure_sinks() -> None:
+    """Register the webhook and file sinks enabled in settings"""
+    if settings.OUTBOX_WEBHOOK_URL:
+        register_sink(WebhookSink(settings.OUTBOX_WEBHOOK_URL))
+    if settings.OUTBOX_FILE_PATH:
+        register_sink(FileSink(settings.OUTBOX_FILE_PATH))
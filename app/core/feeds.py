@@ -0,0 +1,133 @@
+"""
+sitemap.xml and feed.xml documents built from published posts
+
+Documents are generated with keyset iteration and streamed to the client
+while being collected; the finished bytes are cached together with the
+version they were built from (latest ``updated_at`` and post count of the
+posts they cover). The version query is itself cached for a few seconds,
+so a document is only rebuilt after a post it covers actually changed.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, AsyncIterator, Hashable, List, Optional, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.crud import post as crud_post
+from app.utils.cache import get_cache
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Short-lived: bounds how long a change made by another worker goes unnoticed
+version_cache = get_cache("posts", ttl=settings.FEED_CHECK_SECONDS, maxsize=16)
+# Entries carry their own version, so they stay valid until the posts change
+document_cache = get_cache("feeds", ttl=24 * 3600, maxsize=settings.SITEMAP_CACHE_DOCUMENTS)
+
+
+def post_url(slug: str) -> str:
+    return f"{settings.SITE_URL.rstrip('/')}/posts/{quote(slug)}"
+
+
+def w3c_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def http_datetime(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def make_etag(version: Hashable) -> str:
+    return '"' + hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:20] + '"'
+
+
+async def published_version(db: AsyncSession) -> Tuple[Optional[datetime], int]:
+    version = version_cache.get("published")
+    if version is None:
+        version = await crud_post.get_published_fingerprint(db=db)
+        version_cache.set("published", version)
+    return version
+
+
+async def sitemap_shards(db: AsyncSession) -> List[Tuple[int, datetime, int]]:
+    key = ("shards", settings.SITEMAP_SHARD_SIZE)
+    shards = version_cache.get(key)
+    if shards is None:
+        shards = await crud_post.get_sitemap_shards(db=db, shard_size=settings.SITEMAP_SHARD_SIZE)
+        version_cache.set(key, shards)
+    return shards
+
+
+def get_cached_document(key: Hashable, version: Hashable) -> Optional[bytes]:
+    cached = document_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    return None
+
+
+async def stream_and_cache(key: Hashable, version: Hashable, chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Pass ``chunks`` through as bytes and cache the whole document once it is complete"""
+    parts = []
+    async for chunk in chunks:
+        data = chunk.encode("utf-8")
+        parts.append(data)
+        yield data
+    document_cache.set(key, (version, b"".join(parts)))
+
+
+async def sitemap_urlset(
+        db: AsyncSession, start_id: int = 0, end_id: Optional[int] = None
+) -> AsyncIterator[str]:
+    yield f'{XML_HEADER}<urlset xmlns="{SITEMAP_NS}">\n'
+    async for rows in crud_post.iter_published_urls(
+            db=db, start_id=start_id, end_id=end_id, batch_size=settings.SITEMAP_BATCH_SIZE
+    ):
+        yield "".join(
+            f"<url><loc>{escape(post_url(row.slug))}</loc>"
+            f"<lastmod>{w3c_datetime(row.updated_at)}</lastmod></url>\n"
+            for row in rows
+        )
+    yield "</urlset>\n"
+
+
+def sitemap_index(shards: List[Tuple[int, datetime, int]]) -> str:
+    base = settings.SITE_URL.rstrip("/")
+    entries = "".join(
+        f"<sitemap><loc>{escape(f'{base}/sitemaps/posts-{shard}.xml')}</loc>"
+        f"<lastmod>{w3c_datetime(last_modified)}</lastmod></sitemap>\n"
+        for shard, last_modified, _ in shards
+    )
+    return f'{XML_HEADER}<sitemapindex xmlns="{SITEMAP_NS}">\n{entries}</sitemapindex>\n'
+
+
+def _rss_item(post: Any) -> str:
+    link = escape(post_url(post.slug))
+    parts = [
+        f"<title>{escape(post.title)}</title>",
+        f"<link>{link}</link>",
+        f'<guid isPermaLink="true">{link}</guid>',
+    ]
+    if post.published_at is not None:
+        parts.append(f"<pubDate>{http_datetime(post.published_at)}</pubDate>")
+    if post.category is not None:
+        parts.append(f"<category>{escape(post.category.name)}</category>")
+    if post.excerpt:
+        parts.append(f"<description>{escape(post.excerpt)}</description>")
+    return f"<item>{''.join(parts)}</item>\n"
+
+
+async def rss_feed(db: AsyncSession, last_modified: Optional[datetime]) -> AsyncIterator[str]:
+    base = settings.SITE_URL.rstrip("/")
+    channel = [
+        f"<title>{escape(settings.PROJECT_NAME)}</title>",
+        f"<link>{escape(base)}/</link>",
+        f"<description>{escape(settings.PROJECT_NAME)}</description>",
+    ]
+    if last_modified is not None:
+        channel.append(f"<lastBuildDate>{http_datetime(last_modified)}</lastBuildDate>")
+    yield f'{XML_HEADER}<rss version="2.0"><channel>{"".join(channel)}\n'
+    posts = await crud_post.get_latest_published(db=db, limit=settings.FEED_SIZE)
+    yield "".join(_rss_item(post) for post in posts)
+    yield "</channel></rss>\n"
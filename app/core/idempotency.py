@@ -0,0 +1,131 @@
+"""
+Idempotency-Key handling for POST endpoints
+
+The first request with a key claims it by inserting an in-progress row,
+runs, and stores its response (compressed JSON) for IDEMPOTENCY_TTL_SECONDS.
+The write and its stored response commit in one transaction, so a claim
+left in progress by a dead worker never has a committed write behind it
+and can safely run again once abandoned.
+Retries are answered from the stored response without running again.
+Duplicates that arrive while the first request runs wait for it: within a
+worker on the in-flight call itself, across workers by polling the row.
+Failed requests release their claim and store nothing, so they can be retried.
+"""
+import asyncio
+import hashlib
+import json
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, NamedTuple, Type
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.crud import idempotency_key as crud_idempotency_key
+from app.utils.exceptions import ConflictException, UnprocessableEntityException
+from app.utils.singleflight import SingleFlight
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+idempotency_flight = SingleFlight(max_keys=settings.SINGLEFLIGHT_MAX_KEYS)
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: int
+    body: bytes
+    replayed: bool
+
+
+def request_hash(scope: str, payload: Any) -> str:
+    """Fingerprint of a request, so a key reused for a different request is rejected"""
+    canonical = json.dumps([scope, payload], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def run_idempotent(
+        db: AsyncSession,
+        user_id: int,
+        key: str,
+        scope: str,
+        payload: Any,
+        execute: Callable[[bool], Awaitable[Any]],
+        response_model: Type[BaseModel],
+        status_code: int,
+) -> Response:
+    """
+    Run ``execute`` at most once per (user, key) and return its response, stored or fresh.
+
+    ``execute(commit)`` is called with ``commit=False`` and must leave its write
+    uncommitted; it is committed together with the stored response.
+    """
+    fingerprint = request_hash(scope, payload)
+    stored, shared = await idempotency_flight.do(
+        (user_id, key),
+        lambda: _execute_once(db, user_id, key, scope, fingerprint, execute, response_model, status_code),
+    )
+    if stored.request_hash != fingerprint:
+        raise UnprocessableEntityException(detail="Idempotency-Key was already used for a different request")
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true" if stored.replayed or shared else "false"},
+    )
+
+
+async def _execute_once(
+        db: AsyncSession,
+        user_id: int,
+        key: str,
+        scope: str,
+        fingerprint: str,
+        execute: Callable[[bool], Awaitable[Any]],
+        response_model: Type[BaseModel],
+        status_code: int,
+) -> StoredResponse:
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        now = datetime.utcnow()
+        record = await crud_idempotency_key.get(db=db, user_id=user_id, key=key)
+        if record is None:
+            claimed = await crud_idempotency_key.claim(
+                db=db, user_id=user_id, key=key, scope=scope, request_hash=fingerprint,
+                created_at=now, expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            )
+            if claimed:
+                break
+            continue
+
+        abandoned_before = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+        if record.expires_at <= now or (record.status_code is None and record.created_at < abandoned_before):
+            await crud_idempotency_key.delete_stale(
+                db=db, user_id=user_id, key=key, now=now, abandoned_before=abandoned_before
+            )
+            continue
+        if record.request_hash != fingerprint:
+            # run_idempotent rejects it on the hash mismatch
+            return StoredResponse(record.request_hash, 0, b"", True)
+        if record.status_code is not None:
+            return StoredResponse(record.request_hash, record.status_code, zlib.decompress(record.response), True)
+        if time.monotonic() >= deadline:
+            raise ConflictException(
+                detail="A request with this Idempotency-Key is still being processed", retry_after=1
+            )
+        # End the read transaction so the next poll sees the other request's commit
+        await db.rollback()
+        await asyncio.sleep(settings.IDEMPOTENCY_POLL_SECONDS)
+
+    try:
+        result = await execute(False)
+        body = response_model.model_validate(result).model_dump_json().encode("utf-8")
+        await crud_idempotency_key.complete(
+            db=db, user_id=user_id, key=key, status_code=status_code, response=zlib.compress(body)
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        await crud_idempotency_key.release(db=db, user_id=user_id, key=key)
+        raise
+    return StoredResponse(fingerprint, status_code, body, False)
@@ -0,0 +1,144 @@
+"""
+Per-request profiles and the on-disk ring buffer that keeps them
+
+Two backends: cProfile (stdlib, CPU time per function, saved as a pstats
+dump plus a text report) and pyinstrument when installed (statistical,
+async-aware call tree that attributes awaited time to the awaiting request,
+saved as HTML plus text). Both hook the interpreter globally, so one
+request per worker is profiled at a time; cProfile also counts other
+requests' CPU time spent while it runs.
+
+Each profile is a set of files sharing an id in PROFILING_DIR, with a
+JSON metadata file; only the newest PROFILING_MAX_PROFILES are kept.
+"""
+import asyncio
+import io
+import json
+import os
+import re
+import secrets
+import time
+from typing import Any, Dict, List, Optional
+from app.config import settings
+
+PROFILE_ID = re.compile(r"^[0-9]+-[0-9a-f]+$")
+FORMATS = {"txt": "text/plain", "prof": "application/octet-stream", "html": "text/html"}
+
+
+def pyinstrument_available() -> bool:
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_backend() -> str:
+    if settings.PROFILING_BACKEND == "auto":
+        return "pyinstrument" if pyinstrument_available() else "cprofile"
+    return settings.PROFILING_BACKEND
+
+
+class RequestProfiler:
+    """Wraps one profiler run; ``outputs`` renders the result as {format: bytes}"""
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        if backend == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler(async_mode="enabled")
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.backend == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self.backend == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def outputs(self) -> Dict[str, bytes]:
+        if self.backend == "pyinstrument":
+            return {
+                "html": self._profiler.output_html().encode("utf-8"),
+                "txt": self._profiler.output_text(unicode=True, show_all=False).encode("utf-8"),
+            }
+        import marshal
+        import pstats
+        self._profiler.create_stats()
+        report = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(settings.PROFILING_TOP_FUNCTIONS)
+        stats.sort_stats("tottime").print_stats(settings.PROFILING_TOP_FUNCTIONS)
+        return {"prof": marshal.dumps(self._profiler.stats), "txt": report.getvalue().encode("utf-8")}
+
+
+class ProfileStore:
+    """Bounded ring buffer of profiles in a directory, oldest evicted first"""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def new_id(self) -> str:
+        return f"{time.time_ns() // 1_000_000}-{secrets.token_hex(3)}"
+
+    async def save(self, profile_id: str, profiler: RequestProfiler, metadata: Dict[str, Any]) -> None:
+        """Render the profiler's outputs and write them, off the event loop"""
+        await asyncio.to_thread(self._save, profile_id, profiler, metadata)
+
+    def _save(self, profile_id: str, profiler: RequestProfiler, metadata: Dict[str, Any]) -> None:
+        outputs = profiler.outputs()
+        os.makedirs(self.directory, exist_ok=True)
+        for fmt, data in outputs.items():
+            with open(self._path(profile_id, fmt), "wb") as f:
+                f.write(data)
+        metadata = {**metadata, "id": profile_id, "formats": sorted(outputs)}
+        # Metadata last: a profile is listed only once all its files exist
+        with open(self._path(profile_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        self._evict()
+
+    def _evict(self) -> None:
+        for profile_id in self._ids()[self.max_profiles:]:
+            for name in os.listdir(self.directory):
+                if name.startswith(f"{profile_id}."):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+
+    def _ids(self) -> List[str]:
+        """Profile ids, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        ids = {name.split(".", 1)[0] for name in os.listdir(self.directory) if name.endswith(".json")}
+        return sorted(ids, key=lambda profile_id: int(profile_id.split("-", 1)[0]), reverse=True)
+
+    def _path(self, profile_id: str, fmt: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{fmt}")
+
+    def list(self) -> List[Dict[str, Any]]:
+        profiles = []
+        for profile_id in self._ids():
+            try:
+                with open(self._path(profile_id, "json"), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (FileNotFoundError, ValueError):
+                continue
+        return profiles
+
+    def file_path(self, profile_id: str, fmt: str) -> Optional[str]:
+        if not PROFILE_ID.match(profile_id) or fmt not in FORMATS:
+            return None
+        path = self._path(profile_id, fmt)
+        return path if os.path.isfile(path) else None
+
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_PROFILES)
@@ -0,0 +1,75 @@
+"""
+Markdown rendering for post content
+
+Posts are rendered once on write and the results stored next to the raw
+content. Small documents render inline; anything larger than
+RENDER_INLINE_MAX_CHARS goes to a process pool so the event loop never
+blocks on a big import.
+"""
+import asyncio
+import html
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import nh3
+from app.config import settings
+
+WORDS_PER_MINUTE = 200
+EXCERPT_MAX_CHARS = 300
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.RENDER_MAX_WORKERS)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def html_to_text(value: str) -> str:
+    return " ".join(html.unescape(nh3.clean(value, tags=set())).split())
+
+
+def make_excerpt(text: str, max_chars: int = EXCERPT_MAX_CHARS) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(".,;:!?") + "…"
+
+
+def render_sync(content: str) -> Dict[str, Any]:
+    """Render Markdown to sanitized HTML and derive excerpt, word count and reading time"""
+    # Deferred to the first render to keep it off the startup path
+    import markdown
+    content_html = nh3.clean(markdown.markdown(content, extensions=["extra", "sane_lists"]))
+    text = html_to_text(content_html)
+    word_count = len(text.split())
+    return {
+        "content_html": content_html,
+        "generated_excerpt": make_excerpt(text),
+        "word_count": word_count,
+        "reading_time_minutes": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+    }
+
+
+async def render_content(content: str) -> Dict[str, Any]:
+    if len(content) <= settings.RENDER_INLINE_MAX_CHARS:
+        return render_sync(content)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), render_sync, content)
+
+
+async def render_contents(contents: List[str]) -> List[Dict[str, Any]]:
+    """Render a batch (e.g. an import) in the process pool"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(
+        loop.run_in_executor(get_executor(), render_sync, content) for content in contents
+    ))
@@ -0,0 +1,69 @@
+"""
+Compact post revisions
+
+A revision is either a full snapshot of the versioned fields or a delta
+against the previous revision. Content deltas are line based: each op is
+either ``[start, end]`` (copy those lines of the previous version) or a
+string (inserted text). Payloads are stored as zlib-compressed JSON.
+"""
+import difflib
+import json
+import zlib
+from typing import Any, Dict, List, Union
+
+VERSIONED_FIELDS = ("title", "content", "excerpt")
+
+ContentOp = Union[List[int], str]
+
+
+def pack(payload: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+
+def diff_content(old: str, new: str) -> List[ContentOp]:
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops: List[ContentOp] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def patch_content(old: str, ops: List[ContentOp]) -> str:
+    old_lines = old.splitlines(keepends=True)
+    return "".join(
+        "".join(old_lines[op[0]:op[1]]) if isinstance(op, list) else op
+        for op in ops
+    )
+
+
+def make_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta from ``old`` to ``new``; only fields that changed are included"""
+    delta: Dict[str, Any] = {}
+    for field in VERSIONED_FIELDS:
+        if old.get(field) == new.get(field):
+            continue
+        if field == "content":
+            delta[field] = diff_content(old.get(field) or "", new.get(field) or "")
+        else:
+            delta[field] = new.get(field)
+    return delta
+
+
+def apply_delta(old: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    new = dict(old)
+    for field, value in delta.items():
+        new[field] = patch_content(old.get(field) or "", value) if field == "content" else value
+    return new
+
+
+def versioned_state(obj: Any) -> Dict[str, Any]:
+    return {field: getattr(obj, field) for field in VERSIONED_FIELDS}
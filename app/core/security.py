@@ -0,0 +1,107 @@
+"""
+Password hashing and access tokens
+
+bcrypt is deliberately slow (~250 ms at cost 12), so hashing and verification
+run in a bounded executor instead of on the event loop. Access tokens are
+signed JWTs verified locally, without a database round trip.
+"""
+import asyncio
+import hmac
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import bcrypt
+import jwt
+from app.config import settings
+
+BCRYPT_MAX_BYTES = 72
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_MAX_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _encode(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+def hash_password_sync(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds=rounds)).decode("ascii")
+
+
+def verify_password_sync(password: str, hashed_password: str) -> bool:
+    if not is_bcrypt_hash(hashed_password):
+        # Rows created before hashing was introduced hold the plain password
+        return hmac.compare_digest(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return bcrypt.checkpw(_encode(password), hashed_password.encode("ascii"))
+
+
+def is_bcrypt_hash(hashed_password: str) -> bool:
+    return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash is legacy plain text or uses a different cost than configured"""
+    if not is_bcrypt_hash(hashed_password):
+        return True
+    rounds = int(hashed_password.split("$")[2])
+    return rounds != settings.PASSWORD_BCRYPT_ROUNDS
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), hash_password_sync, password, settings.PASSWORD_BCRYPT_ROUNDS
+    )
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), verify_password_sync, password, hashed_password
+    )
+
+
+async def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a fresh hash when the stored one is outdated"""
+    if not await verify_password(password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, await hash_password(password)
+    return True, None
+
+
+def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    payload = {"sub": str(user_id), "exp": expire}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[int]:
+    """Return the user id from a valid token, or None if the token is invalid or expired"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        return int(payload["sub"])
+    except (jwt.PyJWTError, KeyError, ValueError):
+        return None
@@ -0,0 +1,56 @@
+"""
+View buffering and precomputed trending lists
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+TRENDING_WINDOWS: Dict[str, timedelta] = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+
+
+def truncate_to_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class ViewBuffer:
+    """Accumulates post views in memory until the flusher writes them as hourly buckets"""
+
+    def __init__(self):
+        self._counts: Dict[Tuple[int, datetime], int] = {}
+
+    def record(self, post_id: int, at: Optional[datetime] = None) -> None:
+        key = (post_id, truncate_to_hour(at or datetime.utcnow()))
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def drain(self) -> Dict[Tuple[int, datetime], int]:
+        counts, self._counts = self._counts, {}
+        return counts
+
+    def restore(self, counts: Dict[Tuple[int, datetime], int]) -> None:
+        """Put back counts from a failed flush so they are retried"""
+        for key, count in counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class TrendingStore:
+    """Latest top-K (post_id, views) list per window"""
+
+    def __init__(self):
+        self._lists: Dict[str, List[Tuple[int, int]]] = {}
+        self.refreshed_at: Optional[datetime] = None
+
+    def get(self, window: str) -> Optional[List[Tuple[int, int]]]:
+        return self._lists.get(window)
+
+    def set(self, window: str, top: List[Tuple[int, int]]) -> None:
+        self._lists[window] = top
+        self.refreshed_at = datetime.utcnow()
+
+
+view_buffer = ViewBuffer()
+trending_store = TrendingStore()
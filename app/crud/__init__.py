@@ -2,5 +2,12 @@ from app.crud.crud_user import user
 from app.crud.crud_category import category
 from app.crud.crud_post import post
 from app.crud.crud_comment import comment
+from app.crud.crud_post_view import post_view
+from app.crud.crud_outbox import outbox
+from app.crud.crud_comment_archive import comment_archive
+from app.crud.crud_post_revision import post_revision
+from app.crud.crud_tag import tag
+from app.crud.crud_user_stats import user_stats
+from app.crud.crud_idempotency_key import idempotency_key
 
-__all__ = ["user", "category", "post", "comment"]
+__all__ = ["user", "category", "post", "comment", "post_view", "outbox", "comment_archive", "post_revision", "tag", "user_stats", "idempotency_key"]
@@ -1,19 +1,39 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
+from typing import Generic, TypeVar, Type, Optional, List, Any, Awaitable, Callable, Dict
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
 from sqlalchemy.exc import IntegrityError
+from app.config import settings
 from app.db.base import Base
+from app.utils.singleflight import SingleFlight
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+read_flight = SingleFlight(max_keys=settings.SINGLEFLIGHT_MAX_KEYS)
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
+    async def _coalesced(self, db: AsyncSession, key: tuple, query: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a read-only ``query`` once for concurrent identical calls in this worker.
+
+        Callers that joined another caller's query get the loaded objects merged
+        into their own session without hitting the database.
+        """
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return await query()
+        result, shared = await read_flight.do((f"{type(self).__name__}.{key[0]}", *key[1:]), query)
+        if not shared or result is None:
+            return result
+        if isinstance(result, list):
+            return [await db.merge(obj, load=False) for obj in result]
+        return await db.merge(result, load=False)
+
     async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
         result = await db.execute(select(self.model).where(self.model.id == id))
         return result.scalar_one_or_none()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.crud.base import CRUDBase
@@ -7,7 +7,14 @@ from app.schemas.category import CategoryCreate, CategoryUpdate
 
 class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
     async def get_by_slug(self, db: AsyncSession, slug: str) -> Optional[Category]:
-        result = await db.execute(select(Category).where(Category.slug == slug))
-        return result.scalar_one_or_none()
+        async def query() -> Optional[Category]:
+            result = await db.execute(select(Category).where(Category.slug == slug))
+            return result.scalar_one_or_none()
+
+        return await self._coalesced(db, ("get_by_slug", slug), query)
+
+    async def get_multi(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Category]:
+        load = super().get_multi
+        return await self._coalesced(db, ("get_multi", skip, limit), lambda: load(db=db, skip=skip, limit=limit))
 
 category = CRUDCategory(Category)
\ No newline at end of file
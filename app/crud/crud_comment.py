@@ -1,33 +1,221 @@
-from typing import List
+from typing import List, Optional, Any, Dict, Tuple, Union
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, case, func, and_, or_
 from sqlalchemy.orm import selectinload
 from app.crud.base import CRUDBase
+from app.crud.crud_comment_archive import comment_archive
+from app.crud.crud_user_stats import user_stats
+from app.db.outbox import record_events
 from app.models.comment import Comment
-from app.schemas.comment import CommentCreate, CommentUpdate
+from app.models.post import Post
+from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 
 
 class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
     async def get_by_post(
             self, db: AsyncSession, post_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Union[Comment, CommentResponse]]:
+        """Comments of a post in id order, archived ones (always the oldest) first"""
+        archived = await comment_archive.count_by_post(db=db, post_id=post_id)
+        comments: List[Union[Comment, CommentResponse]] = []
+        if skip < archived:
+            comments.extend(await comment_archive.get_by_post(db=db, post_id=post_id, skip=skip, limit=limit))
+        if len(comments) < limit:
+            result = await db.execute(
+                select(Comment)
+                .options(selectinload(Comment.author))
+                .where(Comment.post_id == post_id)
+                .order_by(Comment.id)
+                .offset(max(skip - archived, 0))
+                .limit(limit - len(comments))
+            )
+            comments.extend(result.scalars().all())
+        return comments
+
+    async def get_or_restore(self, db: AsyncSession, id: int) -> Optional[Comment]:
+        """Get a comment for writing, moving its thread back from the archive if needed"""
+        db_obj = await self.get(db=db, id=id)
+        if db_obj is None and await comment_archive.restore_comment(db=db, id=id):
+            db_obj = await self.get(db=db, id=id)
+        return db_obj
+
+    async def get_pending(
+            self, db: AsyncSession, after: Optional[Tuple[datetime, int]] = None, limit: int = 100
     ) -> List[Comment]:
+        """Unapproved comments, oldest first, keyset-paged after (created_at, id)"""
+        query = select(Comment).where(Comment.is_approved == False)
+        if after is not None:
+            created_at, id = after
+            query = query.where(or_(
+                Comment.created_at > created_at,
+                and_(Comment.created_at == created_at, Comment.id > id),
+            ))
         result = await db.execute(
-            select(Comment)
-            .options(selectinload(Comment.author))
-            .where(Comment.post_id == post_id)
-            .offset(skip)
-            .limit(limit)
+            query.order_by(Comment.created_at, Comment.id).limit(limit)
         )
         return list(result.scalars().all())
 
     async def create_with_author(
-            self, db: AsyncSession, obj_in: CommentCreate, author_id: int
+            self, db: AsyncSession, obj_in: CommentCreate, author_id: int, commit: bool = True
     ) -> Comment:
+        """Create a comment; with ``commit=False`` it is only flushed, for callers that commit more with it"""
         db_obj = Comment(**obj_in.model_dump(), author_id=author_id)
+        db.add(db_obj)
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+            self, db: AsyncSession, id: int, obj_in: CommentUpdate | Dict[str, Any]
+    ) -> Optional[Comment]:
+        db_obj = await self.get_or_restore(db=db, id=id)
+        if not db_obj:
+            return None
+
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        is_approved = update_data.get("is_approved")
+        if is_approved is not None and is_approved != db_obj.is_approved:
+            await self._adjust_approved_counts(db, {db_obj.post_id: 1 if is_approved else -1})
+
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def delete(self, db: AsyncSession, id: int) -> Optional[Comment]:
+        """Soft delete; the purger removes the row later"""
+        db_obj = await self.get_or_restore(db=db, id=id)
+        if not db_obj:
+            return None
+        await self.soft_delete_where(db, Comment.id == id, now=datetime.utcnow())
+        await db.commit()
+        return db_obj
+
+    async def soft_delete_where(self, db: AsyncSession, *criteria, now: datetime) -> None:
+        """Mark matching comments deleted with one UPDATE and drop approved ones from the post counters; doesn't commit"""
+        result = await db.execute(
+            select(Comment.post_id, func.count())
+            .where(*criteria, Comment.is_approved == True)
+            .group_by(Comment.post_id)
+        )
+        await self._adjust_approved_counts(db, {post_id: -count for post_id, count in result})
+        result = await db.execute(select(Comment.id).where(*criteria))
+        ids = list(result.scalars().all())
+        await db.execute(
+            update(Comment)
+            .where(*criteria, Comment.deleted_at.is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await record_events(db, "comment", ids, "deleted")
+
+    async def soft_delete_by_author(self, db: AsyncSession, author_id: int, now: datetime) -> None:
+        """Mark all of an author's comments deleted, hot and archived; doesn't commit"""
+        await self.soft_delete_where(db, Comment.author_id == author_id, now=now)
+        ids, approved = await comment_archive.soft_delete_by_author(db, author_id, now=now)
+        await self._adjust_approved_counts(db, {post_id: -count for post_id, count in approved.items()})
+        await record_events(db, "comment", ids, "deleted")
+
+    async def purge_deleted(self, db: AsyncSession, before: datetime, limit: int = 500) -> int:
+        """Hard-delete up to ``limit`` comments soft-deleted before ``before``"""
+        result = await db.execute(
+            select(Comment.id)
+            .where(Comment.deleted_at < before)
+            .order_by(Comment.deleted_at)
+            .limit(limit)
+            .execution_options(include_deleted=True)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            await db.rollback()
+            return 0
+        await db.execute(
+            update(Comment)
+            .where(Comment.parent_id.in_(ids))
+            .values(parent_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(Comment).where(Comment.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return len(ids)
+
+    async def moderate(
+            self, db: AsyncSession, ids: List[int], action: str, batch_size: int = 500
+    ) -> int:
+        """
+        Approve or reject comments in batches.
+
+        Each batch is one transaction: a locking read of the affected rows,
+        one UPDATE ... WHERE id IN (...) and one UPDATE of the post counters.
+        Rejecting soft-deletes the comments. Ids in archived threads are
+        moderated too: those threads are restored first.
+        """
+        affected = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            result = await db.execute(select(Comment.id).where(Comment.id.in_(batch)))
+            hot_ids = set(result.scalars().all())
+            await comment_archive.restore_comments(db, [id for id in batch if id not in hot_ids])
+            result = await db.execute(
+                select(Comment.id, Comment.post_id, Comment.is_approved)
+                .where(Comment.id.in_(batch))
+                .with_for_update()
+            )
+            rows = result.all()
+
+            deltas: Dict[int, int] = {}
+            if action == "approve":
+                target_ids = [row.id for row in rows if not row.is_approved]
+                for row in rows:
+                    if not row.is_approved:
+                        deltas[row.post_id] = deltas.get(row.post_id, 0) + 1
+                if target_ids:
+                    await db.execute(
+                        update(Comment)
+                        .where(Comment.id.in_(target_ids))
+                        .values(is_approved=True)
+                    )
+                    await record_events(db, "comment", target_ids, "updated", ["is_approved"])
+            else:
+                target_ids = [row.id for row in rows]
+                if target_ids:
+                    # Counters and events come with the soft delete; purge_deleted detaches replies later
+                    await self.soft_delete_where(db, Comment.id.in_(target_ids), now=datetime.utcnow())
+
+            await self._adjust_approved_counts(db, deltas)
+            await db.commit()
+            affected += len(target_ids)
+        return affected
+
+    async def _adjust_approved_counts(self, db: AsyncSession, deltas: Dict[int, int]) -> None:
+        """Apply per-post approved comment count deltas in a single UPDATE"""
+        deltas = {post_id: delta for post_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        await db.execute(
+            update(Post)
+            .where(Post.id.in_(deltas))
+            .values(
+                approved_comment_count=Post.approved_comment_count
+                + case(deltas, value=Post.id, else_=0),
+                updated_at=Post.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await user_stats.apply_by_post(db, "comment_count", deltas)
+
 
-comment = CRUDComment(Comment)
\ No newline at end of file
+comment = CRUDComment(Comment)
@@ -0,0 +1,331 @@
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, insert, func, exists, or_
+from app.models.comment import Comment
+from app.models.comment_archive import CommentArchive, CommentArchiveAuthor, CommentArchiveComment
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.comment import CommentResponse
+from app.schemas.user import UserResponse
+
+ARCHIVED_FIELDS = ("id", "content", "is_approved", "author_id", "post_id", "parent_id", "created_at", "updated_at",
+                   "deleted_at")
+
+
+def pack_comments(rows: List[Dict[str, Any]]) -> bytes:
+    payload = [
+        {field: row[field].isoformat() if isinstance(row[field], datetime) else row[field]
+         for field in ARCHIVED_FIELDS}
+        for row in rows
+    ]
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack_comments(data: bytes) -> List[Dict[str, Any]]:
+    rows = json.loads(zlib.decompress(data))
+    for row in rows:
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+        row["updated_at"] = datetime.fromisoformat(row["updated_at"])
+        # Chunks archived before deleted_at was kept have no such key
+        deleted_at = row.get("deleted_at")
+        row["deleted_at"] = datetime.fromisoformat(deleted_at) if deleted_at else None
+    return rows
+
+
+def live_comments(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [row for row in rows if row["deleted_at"] is None]
+
+
+class CRUDCommentArchive:
+    """
+    Cold storage for comment threads on inactive posts.
+
+    A post's thread is archived as a whole, so parent/child links never cross
+    between the hot table and the archive. Archived comments are read back as
+    CommentResponse snapshots; writing to one restores the thread first.
+
+    Soft-deleted comments are archived too, with their ``deleted_at``, so
+    replies never lose their parent; reads skip them and ``comment_count``
+    counts only live comments. Threads of deleted posts are neither read nor
+    restored. ``comment_archive_authors`` indexes the authors in each chunk,
+    so deleting or purging a user touches only the chunks holding their comments;
+    ``comment_archive_comments`` maps each archived comment id to its chunk.
+    """
+
+    def _has_activity(self, cutoff: datetime):
+        """Comments that keep a post hot: recent ones, and ones still awaiting moderation"""
+        return exists().where(
+            Comment.post_id == Post.id,
+            or_(Comment.created_at >= cutoff, Comment.is_approved == False),
+        )
+
+    async def get_archivable_post_ids(
+            self, db: AsyncSession, cutoff: datetime, limit: int = 50
+    ) -> List[int]:
+        result = await db.execute(
+            select(Post.id)
+            .where(
+                Post.updated_at < cutoff,
+                exists().where(Comment.post_id == Post.id),
+                ~self._has_activity(cutoff),
+            )
+            .order_by(Post.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def archive_post(
+            self, db: AsyncSession, post_id: int, cutoff: datetime, chunk_size: int = 500
+    ) -> int:
+        """
+        Move one post's comments into compressed chunks in a single transaction.
+
+        The post row is locked with SKIP LOCKED so concurrent archivers split the
+        work, and inactivity is re-checked under the lock. Returns the number of
+        comments archived.
+        """
+        locked = await db.execute(
+            select(Post.id)
+            .where(Post.id == post_id, Post.updated_at < cutoff, ~self._has_activity(cutoff))
+            .with_for_update(skip_locked=True)
+        )
+        if locked.scalar_one_or_none() is None:
+            await db.rollback()
+            return 0
+
+        result = await db.execute(
+            select(*(getattr(Comment, field) for field in ARCHIVED_FIELDS))
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.id)
+            .with_for_update()
+            .execution_options(include_deleted=True)
+        )
+        rows = [dict(row._mapping) for row in result]
+        if not rows:
+            await db.rollback()
+            return 0
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            archive = CommentArchive(post_id=post_id)
+            self._pack(archive, chunk)
+            db.add(archive)
+            await db.flush()
+            await db.execute(insert(CommentArchiveAuthor), [
+                {"author_id": author_id, "archive_id": archive.id}
+                for author_id in sorted({row["author_id"] for row in chunk})
+            ])
+            await db.execute(insert(CommentArchiveComment), [
+                {"comment_id": row["id"], "archive_id": archive.id} for row in chunk
+            ])
+        # Replies reference their parent; the whole thread goes, so detach before deleting
+        await db.execute(
+            update(Comment)
+            .where(Comment.post_id == post_id, Comment.parent_id.is_not(None))
+            .values(parent_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(Comment)
+            .where(Comment.post_id == post_id)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return len(rows)
+
+    async def count_by_post(self, db: AsyncSession, post_id: int) -> int:
+        result = await db.execute(
+            select(func.coalesce(func.sum(CommentArchive.comment_count), 0))
+            .where(CommentArchive.post_id == post_id)
+        )
+        return int(result.scalar_one())
+
+    async def get_by_post(
+            self, db: AsyncSession, post_id: int, skip: int = 0, limit: int = 100
+    ) -> List[CommentResponse]:
+        """Archived comments of a post in id order; only the chunks overlapping the page are decompressed"""
+        result = await db.execute(
+            select(CommentArchive.comment_count, CommentArchive.data)
+            .join(Post, Post.id == CommentArchive.post_id)
+            .where(CommentArchive.post_id == post_id)
+            .order_by(CommentArchive.first_comment_id)
+        )
+        rows: List[Dict[str, Any]] = []
+        position = 0
+        for count, data in result:
+            if position + count > skip and len(rows) < limit:
+                chunk = live_comments(unpack_comments(data))
+                rows.extend(chunk[max(skip - position, 0):])
+            position += count
+        return await self._to_responses(db, rows[:limit])
+
+    async def get_comment(self, db: AsyncSession, id: int) -> Optional[CommentResponse]:
+        row = await self._find(db, id)
+        if row is None:
+            return None
+        return (await self._to_responses(db, [row]))[0]
+
+    async def restore_post(self, db: AsyncSession, post_id: int) -> int:
+        """Move a post's archived comments back into the hot table with their original ids"""
+        # A deleted post's thread stays archived until the post is purged along with it
+        post = await db.execute(select(Post.id).where(Post.id == post_id))
+        if post.scalar_one_or_none() is None:
+            return 0
+        result = await db.execute(
+            select(CommentArchive)
+            .where(CommentArchive.post_id == post_id)
+            .order_by(CommentArchive.first_comment_id)
+            .with_for_update()
+        )
+        archives = list(result.scalars().all())
+        rows = [row for archive in archives for row in unpack_comments(archive.data)]
+        if rows:
+            # Id order inserts every parent before its replies
+            await db.execute(insert(Comment), rows)
+        await db.execute(
+            delete(CommentArchiveAuthor)
+            .where(CommentArchiveAuthor.archive_id.in_([archive.id for archive in archives]))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(CommentArchiveComment)
+            .where(CommentArchiveComment.archive_id.in_([archive.id for archive in archives]))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(CommentArchive)
+            .where(CommentArchive.id.in_([archive.id for archive in archives]))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return len(rows)
+
+    async def restore_comment(self, db: AsyncSession, id: int) -> bool:
+        """Restore the thread containing an archived comment; False if it isn't archived"""
+        row = await self._find(db, id)
+        if row is None:
+            return False
+        await self.restore_post(db, row["post_id"])
+        return True
+
+    async def restore_comments(self, db: AsyncSession, ids: List[int]) -> int:
+        """Restore the threads containing any of the given archived comments; returns the threads restored"""
+        if not ids:
+            return 0
+        result = await db.execute(
+            select(CommentArchive.post_id)
+            .join(CommentArchiveComment, CommentArchiveComment.archive_id == CommentArchive.id)
+            .where(CommentArchiveComment.comment_id.in_(ids))
+            .distinct()
+        )
+        restored = 0
+        for post_id in sorted(result.scalars().all()):
+            if await self.restore_post(db, post_id):
+                restored += 1
+        return restored
+
+    async def soft_delete_by_author(
+            self, db: AsyncSession, author_id: int, now: datetime
+    ) -> Tuple[List[int], Dict[int, int]]:
+        """
+        Mark an author's live archived comments deleted; doesn't commit.
+
+        Returns the ids marked and the number of approved ones per post, for
+        the caller to take off the post counters.
+        """
+        marked: List[int] = []
+        approved: Dict[int, int] = {}
+        for archive in await self._author_archives(db, author_id, whole_threads=False):
+            rows = unpack_comments(archive.data)
+            for row in live_comments(rows):
+                if row["author_id"] == author_id:
+                    row["deleted_at"] = now
+                    marked.append(row["id"])
+                    if row["is_approved"]:
+                        approved[row["post_id"]] = approved.get(row["post_id"], 0) + 1
+            self._pack(archive, rows)
+        await db.flush()
+        return marked, approved
+
+    async def purge_author(self, db: AsyncSession, author_id: int) -> int:
+        """
+        Drop all of an author's archived comments, detaching replies to them; doesn't commit.
+
+        Replies may sit in another chunk of the thread, so every chunk of each
+        affected post is rewritten. Returns the number of comments dropped.
+        """
+        archives = await self._author_archives(db, author_id, whole_threads=True)
+        await db.execute(
+            delete(CommentArchiveAuthor)
+            .where(CommentArchiveAuthor.author_id == author_id)
+            .execution_options(synchronize_session=False)
+        )
+        dropped = set()
+        for archive in archives:
+            dropped.update(row["id"] for row in unpack_comments(archive.data) if row["author_id"] == author_id)
+        if dropped:
+            await db.execute(
+                delete(CommentArchiveComment)
+                .where(CommentArchiveComment.comment_id.in_(sorted(dropped)))
+                .execution_options(synchronize_session=False)
+            )
+        for archive in archives:
+            rows = [row for row in unpack_comments(archive.data) if row["id"] not in dropped]
+            if not rows:
+                await db.delete(archive)
+                continue
+            for row in rows:
+                if row["parent_id"] in dropped:
+                    row["parent_id"] = None
+            self._pack(archive, rows)
+        await db.flush()
+        return len(dropped)
+
+    async def _author_archives(self, db: AsyncSession, author_id: int, whole_threads: bool) -> List[CommentArchive]:
+        """Locked chunks holding the author's comments, or with ``whole_threads`` every chunk of those posts"""
+        chunks = select(CommentArchiveAuthor.archive_id).where(CommentArchiveAuthor.author_id == author_id)
+        if whole_threads:
+            criteria = CommentArchive.post_id.in_(
+                select(CommentArchive.post_id).where(CommentArchive.id.in_(chunks))
+            )
+        else:
+            criteria = CommentArchive.id.in_(chunks)
+        result = await db.execute(
+            select(CommentArchive).where(criteria).order_by(CommentArchive.id).with_for_update()
+        )
+        return list(result.scalars().all())
+
+    def _pack(self, archive: CommentArchive, rows: List[Dict[str, Any]]) -> None:
+        archive.first_comment_id = rows[0]["id"]
+        archive.last_comment_id = rows[-1]["id"]
+        archive.comment_count = len(live_comments(rows))
+        archive.data = pack_comments(rows)
+
+    async def _find(self, db: AsyncSession, id: int) -> Optional[Dict[str, Any]]:
+        result = await db.execute(
+            select(CommentArchive.data)
+            .join(CommentArchiveComment, CommentArchiveComment.archive_id == CommentArchive.id)
+            .join(Post, Post.id == CommentArchive.post_id)
+            .where(CommentArchiveComment.comment_id == id)
+        )
+        data = result.scalar_one_or_none()
+        if data is None:
+            return None
+        for row in live_comments(unpack_comments(data)):
+            if row["id"] == id:
+                return row
+        return None
+
+    async def _to_responses(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[CommentResponse]:
+        author_ids = {row["author_id"] for row in rows}
+        authors: Dict[int, UserResponse] = {}
+        if author_ids:
+            result = await db.execute(select(User).where(User.id.in_(author_ids)))
+            authors = {user.id: UserResponse.model_validate(user) for user in result.scalars()}
+        return [CommentResponse(**row, author=authors.get(row["author_id"])) for row in rows]
+
+
+comment_archive = CRUDCommentArchive()
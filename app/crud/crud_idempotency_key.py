@@ -0,0 +1,115 @@
+from typing import Any, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, insert, and_, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from app.models.idempotency_key import IdempotencyKey
+
+
+class CRUDIdempotencyKey:
+    """
+    Stored responses for Idempotency-Key requests.
+
+    Reads return plain rows rather than ORM objects, so polling a key that is
+    still in progress always sees the latest committed state.
+    """
+
+    async def get(self, db: AsyncSession, user_id: int, key: str) -> Optional[Any]:
+        result = await db.execute(
+            select(
+                IdempotencyKey.scope,
+                IdempotencyKey.request_hash,
+                IdempotencyKey.status_code,
+                IdempotencyKey.response,
+                IdempotencyKey.created_at,
+                IdempotencyKey.expires_at,
+            )
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        )
+        return result.one_or_none()
+
+    async def claim(
+            self,
+            db: AsyncSession,
+            user_id: int,
+            key: str,
+            scope: str,
+            request_hash: str,
+            created_at: datetime,
+            expires_at: datetime,
+    ) -> bool:
+        """
+        Insert an in-progress row for the key; False if another request got there first.
+
+        ``created_at`` is passed in (UTC, like ``expires_at``) rather than left to the
+        server default, whose time zone is the database session's.
+        """
+        try:
+            await db.execute(insert(IdempotencyKey).values(
+                user_id=user_id, key=key, scope=scope, request_hash=request_hash,
+                created_at=created_at, expires_at=expires_at,
+            ))
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return False
+        return True
+
+    async def complete(
+            self, db: AsyncSession, user_id: int, key: str, status_code: int, response: bytes
+    ) -> None:
+        """Store the response on the claim; doesn't commit, so it lands with the write it answers"""
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(status_code=status_code, response=response)
+        )
+
+    async def release(self, db: AsyncSession, user_id: int, key: str) -> None:
+        """Drop an in-progress claim so the key can be retried"""
+        await db.execute(
+            delete(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+        await db.commit()
+
+    async def delete_stale(
+            self, db: AsyncSession, user_id: int, key: str, now: datetime, abandoned_before: datetime
+    ) -> None:
+        """Delete the key if it expired, or if its request has been in progress since before ``abandoned_before``"""
+        await db.execute(
+            delete(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                or_(
+                    IdempotencyKey.expires_at <= now,
+                    and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.created_at < abandoned_before),
+                ),
+            )
+        )
+        await db.commit()
+
+    async def purge_expired(self, db: AsyncSession, now: datetime, limit: int = 1000) -> int:
+        result = await db.execute(
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= now)
+            .limit(limit)
+        )
+        keys = result.all()
+        if not keys:
+            await db.rollback()
+            return 0
+        await db.execute(
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_([tuple(row) for row in keys]))
+        )
+        await db.commit()
+        return len(keys)
+
+
+idempotency_key = CRUDIdempotencyKey()
@@ -0,0 +1,67 @@
+from typing import List, Tuple, Optional
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func
+from app.models.outbox import OutboxEvent
+
+
+class CRUDOutbox:
+    async def claim_batch(
+            self, db: AsyncSession, now: datetime, lease: timedelta, limit: int = 100
+    ) -> List[OutboxEvent]:
+        """
+        Lease up to ``limit`` due events to this dispatcher.
+
+        Claimed rows are pushed ``lease`` into the future and committed, so
+        delivery happens outside the transaction; if this worker dies the
+        lease runs out and another dispatcher picks the events up again.
+        """
+        result = await db.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.next_attempt_at <= now)
+            .order_by(OutboxEvent.next_attempt_at, OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        events = list(result.scalars().all())
+        if events:
+            await db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([e.id for e in events]))
+                .values(next_attempt_at=now + lease)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+        return events
+
+    async def mark_dispatched(self, db: AsyncSession, ids: List[int]) -> None:
+        if ids:
+            await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            await db.commit()
+
+    async def mark_failed(
+            self, db: AsyncSession, ids: List[int], error: str, retry_at: datetime
+    ) -> None:
+        if ids:
+            await db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(ids))
+                .values(
+                    attempts=OutboxEvent.attempts + 1,
+                    last_error=error[:2000],
+                    next_attempt_at=retry_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    async def get_backlog(self, db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+        """Number of undelivered events and the creation time of the oldest one"""
+        result = await db.execute(
+            select(func.count(OutboxEvent.id), func.min(OutboxEvent.created_at))
+        )
+        count, oldest = result.one()
+        return count, oldest
+
+
+outbox = CRUDOutbox()
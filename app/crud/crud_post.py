@@ -1,66 +1,416 @@
-from typing import Optional, List
+from typing import Optional, List, Any, AsyncIterator, Dict, Literal, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, case, exists, func
 from sqlalchemy.orm import selectinload
 from datetime import datetime
+from app.config import settings
+from app.core.rendering import render_content, render_contents, make_excerpt, html_to_text
+from app.core.revisions import versioned_state
 from app.crud.base import CRUDBase
+from app.crud.crud_post_revision import post_revision
+from app.crud.crud_tag import tag as crud_tag
+from app.crud.crud_user_stats import user_stats, post_deltas
+from app.db.outbox import record_events
+from app.models.comment import Comment
 from app.models.post import Post
+from app.models.tag import post_tags
 from app.schemas.post import PostCreate, PostUpdate
 
 
+def _rendered_fields(rendered: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "content_html": rendered["content_html"],
+        "word_count": rendered["word_count"],
+        "reading_time_minutes": rendered["reading_time_minutes"],
+    }
+
+
 class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
-    async def get_by_slug(self, db: AsyncSession, slug: str) -> Optional[Post]:
-        result = await db.execute(
-            select(Post)
-            .options(selectinload(Post.author), selectinload(Post.category))
-            .where(Post.slug == slug)
-        )
-        return result.scalar_one_or_none()
+    async def get_by_slug(self, db: AsyncSession, slug: str, include_deleted: bool = False) -> Optional[Post]:
+        """``include_deleted`` for uniqueness checks: a deleted post keeps its slug until purged"""
+        async def query() -> Optional[Post]:
+            result = await db.execute(
+                select(Post)
+                .options(selectinload(Post.author), selectinload(Post.category))
+                .where(Post.slug == slug)
+                .execution_options(include_deleted=include_deleted)
+            )
+            return result.scalar_one_or_none()
+
+        return await self._coalesced(db, ("get_by_slug", slug, include_deleted), query)
 
     async def get_multi_with_author(
             self, db: AsyncSession, skip: int = 0, limit: int = 100
     ) -> List[Post]:
-        result = await db.execute(
-            select(Post)
-            .options(selectinload(Post.author), selectinload(Post.category))
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(result.scalars().all())
+        async def query() -> List[Post]:
+            result = await db.execute(
+                select(Post)
+                .options(selectinload(Post.author), selectinload(Post.category))
+                .offset(skip)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+        return await self._coalesced(db, ("get_multi_with_author", skip, limit), query)
+
+    async def get_multi_by_ids(self, db: AsyncSession, ids: List[int]) -> List[Post]:
+        """Load posts by primary key, keeping the order of ``ids``"""
+        if not ids:
+            return []
+        result = await db.execute(select(Post).where(Post.id.in_(ids)))
+        by_id = {post.id: post for post in result.scalars().all()}
+        return [by_id[post_id] for post_id in ids if post_id in by_id]
 
     async def get_published(
             self, db: AsyncSession, skip: int = 0, limit: int = 100
     ) -> List[Post]:
+        async def query() -> List[Post]:
+            result = await db.execute(
+                select(Post)
+                .options(selectinload(Post.author), selectinload(Post.category))
+                .where(Post.is_published == True)
+                .offset(skip)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+        return await self._coalesced(db, ("get_published", skip, limit), query)
+
+    async def get_by_tags(
+            self,
+            db: AsyncSession,
+            tag_ids: List[int],
+            match: Literal["all", "any"] = "all",
+            published_only: bool = False,
+            skip: int = 0,
+            limit: int = 100,
+    ) -> List[Post]:
+        """Posts carrying all (AND) or any (OR) of ``tag_ids``, resolved on ix_post_tags_tag_id_post_id"""
+        tagged = select(post_tags.c.post_id).where(post_tags.c.tag_id.in_(tag_ids))
+        if match == "all":
+            tagged = tagged.group_by(post_tags.c.post_id).having(func.count() == len(tag_ids))
+        query = select(Post).where(Post.id.in_(tagged))
+        if published_only:
+            query = query.where(Post.is_published == True)
+        result = await db.execute(query.order_by(Post.id).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_published_fingerprint(self, db: AsyncSession) -> Tuple[Optional[datetime], int]:
+        """Latest updated_at and number of published posts; changes whenever the published set does"""
+        result = await db.execute(
+            select(func.max(Post.updated_at), func.count()).where(Post.is_published == True)
+        )
+        last_modified, count = result.one()
+        return last_modified, count
+
+    async def get_sitemap_shards(self, db: AsyncSession, shard_size: int) -> List[Tuple[int, datetime, int]]:
+        """
+        ``(shard, last_modified, count)`` per id range of ``shard_size`` holding published posts.
+
+        Shard ``k`` covers ids ``[k * shard_size, (k + 1) * shard_size)``, so a shard
+        never exceeds ``shard_size`` URLs and an edit only changes its own shard.
+        """
+        shard = (Post.id // shard_size).label("shard")
+        result = await db.execute(
+            select(shard, func.max(Post.updated_at), func.count())
+            .where(Post.is_published == True)
+            .group_by(shard)
+            .order_by(shard)
+        )
+        return [(int(shard), last_modified, count) for shard, last_modified, count in result.all()]
+
+    async def iter_published_urls(
+            self,
+            db: AsyncSession,
+            start_id: int = 0,
+            end_id: Optional[int] = None,
+            batch_size: int = 1000,
+    ) -> AsyncIterator[List[Any]]:
+        """Yield ``(id, slug, updated_at)`` rows of published posts in id order, one keyset page at a time"""
+        last_id = start_id - 1
+        while True:
+            query = (
+                select(Post.id, Post.slug, Post.updated_at)
+                .where(Post.is_published == True, Post.id > last_id)
+                .order_by(Post.id)
+                .limit(batch_size)
+            )
+            if end_id is not None:
+                query = query.where(Post.id < end_id)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1].id
+
+    async def get_latest_published(self, db: AsyncSession, limit: int = 50) -> List[Post]:
+        """Newest published posts, read off ix_posts_is_published_published_at"""
         result = await db.execute(
             select(Post)
-            .options(selectinload(Post.author), selectinload(Post.category))
             .where(Post.is_published == True)
-            .offset(skip)
+            .order_by(Post.published_at.desc(), Post.id.desc())
             .limit(limit)
         )
         return list(result.scalars().all())
 
     async def create_with_author(
-            self, db: AsyncSession, obj_in: PostCreate, author_id: int
+            self, db: AsyncSession, obj_in: PostCreate, author_id: int, commit: bool = True
     ) -> Post:
+        """Create a post; with ``commit=False`` it is only flushed, for callers that commit more with it"""
+        now = datetime.utcnow()
+        # A future scheduled_at keeps the post as a draft until the publisher picks it up;
+        # only posts asked to be published are scheduled, so a plain draft never goes live
+        is_published = obj_in.is_published and not (
+            obj_in.scheduled_at is not None and obj_in.scheduled_at > now
+        )
+        scheduled_at = obj_in.scheduled_at if obj_in.is_published and not is_published else None
+        rendered = await render_content(obj_in.content)
+        obj_in_data = obj_in.model_dump(exclude={"is_published", "scheduled_at", "tags"})
+        if not obj_in_data.get("excerpt"):
+            obj_in_data["excerpt"] = rendered["generated_excerpt"]
         db_obj = Post(
-            **obj_in.model_dump(),
+            **obj_in_data,
+            **_rendered_fields(rendered),
+            is_published=is_published,
+            scheduled_at=scheduled_at,
             author_id=author_id,
-            published_at=datetime.utcnow() if obj_in.is_published else None
+            published_at=now if is_published else None
         )
         db.add(db_obj)
+        await db.flush()
+        await post_revision.add(db, post_id=db_obj.id, state=versioned_state(db_obj))
+        if obj_in.tags:
+            await crud_tag.set_post_tags(db, post_id=db_obj.id, names=obj_in.tags)
+        await user_stats.apply(db, {author_id: post_deltas(is_published)})
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+            self, db: AsyncSession, id: int, obj_in: PostUpdate | Dict[str, Any]
+    ) -> Optional[Post]:
+        # Lock and re-read the row first: the revision delta and the stats deltas are
+        # computed from its current state, which a concurrent save must not change underneath
+        result = await db.execute(
+            select(Post)
+            .where(Post.id == id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        db_obj = result.scalar_one_or_none()
+        if not db_obj:
+            return None
+
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        tags = update_data.pop("tags", None)
+        scheduled_at = update_data.get("scheduled_at")
+        if update_data.get("is_published") is False:
+            # Unpublishing cancels any schedule, or the publisher would publish the post again
+            update_data["scheduled_at"] = None
+        elif scheduled_at is not None and scheduled_at > datetime.utcnow():
+            update_data["is_published"] = False
+            update_data["published_at"] = None
+        elif update_data.get("is_published") is True:
+            update_data["scheduled_at"] = None
+
+        if "content" in update_data and update_data["content"] != db_obj.content:
+            rendered = await render_content(update_data["content"])
+            update_data.update(_rendered_fields(rendered))
+            # Keep hand-written excerpts; refresh ones we generated from the old content
+            if "excerpt" not in update_data and (
+                    not db_obj.excerpt
+                    or db_obj.excerpt == make_excerpt(html_to_text(db_obj.content_html or ""))
+            ):
+                update_data["excerpt"] = rendered["generated_excerpt"]
+
+        was_published = db_obj.is_published
+        previous = versioned_state(db_obj)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        state = versioned_state(db_obj)
+        if state != previous:
+            await post_revision.add(
+                db, post_id=db_obj.id, state=state, previous=previous,
+                snapshot_interval=settings.POST_REVISION_SNAPSHOT_INTERVAL,
+            )
+        if tags is not None:
+            await crud_tag.set_post_tags(db, post_id=db_obj.id, names=tags)
+        if db_obj.is_published != was_published:
+            changes = post_deltas(was_published, sign=-1)
+            changes.update(post_deltas(db_obj.is_published))
+            changes["post_count"] = 0
+            await user_stats.apply(db, {db_obj.author_id: changes})
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def render_missing(self, db: AsyncSession, batch_size: int = 100) -> int:
+        """Backfill rendered fields for posts written before rendering existed"""
+        total = 0
+        while True:
+            result = await db.execute(
+                select(Post.id, Post.content, Post.excerpt)
+                .where(Post.content_html.is_(None))
+                .order_by(Post.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return total
+            rendered = await render_contents([row.content for row in rows])
+            await db.execute(
+                update(Post),
+                [
+                    {
+                        "id": row.id,
+                        **_rendered_fields(fields),
+                        "excerpt": row.excerpt or fields["generated_excerpt"],
+                    }
+                    for row, fields in zip(rows, rendered)
+                ],
+            )
+            await db.commit()
+            total += len(rows)
+
+    async def publish_due(
+            self, db: AsyncSession, now: datetime, limit: int = 100
+    ) -> List[int]:
+        """
+        Publish up to ``limit`` posts whose scheduled_at has passed.
+
+        Rows are claimed with FOR UPDATE SKIP LOCKED so publishers running in
+        several workers never pick the same post, then flipped with one UPDATE
+        that also clears scheduled_at, so a post unpublished later stays unpublished.
+        """
+        result = await db.execute(
+            select(Post.id)
+            .where(Post.is_published == False, Post.scheduled_at <= now)
+            .order_by(Post.scheduled_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            await db.rollback()
+            return []
+
+        await db.execute(
+            update(Post)
+            .where(Post.id.in_(ids))
+            # Ordered: MySQL evaluates SET left to right, so published_at is copied before scheduled_at is cleared
+            .ordered_values(
+                (Post.is_published, True),
+                (Post.published_at, Post.scheduled_at),
+                (Post.scheduled_at, None),
+            )
+        )
+        result = await db.execute(
+            select(Post.author_id, func.count()).where(Post.id.in_(ids)).group_by(Post.author_id)
+        )
+        await user_stats.apply(db, {
+            author_id: {"published_count": count, "draft_count": -count} for author_id, count in result
+        })
+        await record_events(db, "post", ids, "updated", ["is_published", "published_at", "scheduled_at"])
+        await db.commit()
+        return ids
+
     async def increment_view_count(self, db: AsyncSession, id: int) -> Optional[Post]:
         db_obj = await self.get(db=db, id=id)
         if not db_obj:
             return None
-        db_obj.view_count += 1
+        # Atomic increment; a view is not an edit, so updated_at stays put
+        await db.execute(
+            update(Post)
+            .where(Post.id == id)
+            .values(view_count=Post.view_count + 1, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def delete(self, db: AsyncSession, id: int) -> Optional[Post]:
+        """Soft delete; the purger removes the post and its comments later"""
+        db_obj = await self.get(db=db, id=id)
+        if not db_obj:
+            return None
+        await self.soft_delete_where(db, Post.id == id, now=datetime.utcnow())
+        await db.commit()
+        return db_obj
+
+    async def soft_delete_where(self, db: AsyncSession, *criteria, now: datetime) -> None:
+        """
+        Mark matching posts and their comments deleted with bulk UPDATEs; doesn't commit.
+
+        The posts' views and approved comments leave their authors' stats with them.
+        """
+        published = func.sum(case((Post.is_published == True, 1), else_=0))
+        result = await db.execute(
+            select(
+                Post.author_id, func.count(), published,
+                func.sum(Post.view_count), func.sum(Post.approved_comment_count),
+            )
+            .where(*criteria)
+            .group_by(Post.author_id)
+        )
+        await user_stats.apply(db, {
+            author_id: {
+                "post_count": -count,
+                "published_count": -int(published),
+                "draft_count": -(count - int(published)),
+                "total_views": -int(views),
+                "comment_count": -int(comments),
+            }
+            for author_id, count, published, views, comments in result
+        })
+        result = await db.execute(select(Post.id).where(*criteria))
+        ids = list(result.scalars().all())
+        await db.execute(
+            update(Comment)
+            .where(Comment.post_id.in_(select(Post.id).where(*criteria)), Comment.deleted_at.is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(Post)
+            .where(*criteria, Post.deleted_at.is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await record_events(db, "post", ids, "deleted")
+
+    async def purge_deleted(self, db: AsyncSession, before: datetime, limit: int = 500) -> int:
+        """
+        Hard-delete up to ``limit`` posts soft-deleted before ``before``.
+
+        Only posts whose comments are already purged are taken, so each batch
+        stays bounded; revisions, tags, view buckets and archives cascade.
+        """
+        result = await db.execute(
+            select(Post.id)
+            .where(Post.deleted_at < before, ~exists().where(Comment.post_id == Post.id))
+            .order_by(Post.deleted_at)
+            .limit(limit)
+            .execution_options(include_deleted=True)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            await db.rollback()
+            return 0
+        await db.execute(delete(Post).where(Post.id.in_(ids)).execution_options(synchronize_session=False))
+        await db.commit()
+        return len(ids)
+
 
 post = CRUDPost(Post)
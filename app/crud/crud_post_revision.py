@@ -0,0 +1,93 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.core.revisions import apply_delta, make_delta, pack, unpack
+from app.models.post import Post
+from app.models.post_revision import PostRevision
+
+
+class CRUDPostRevision:
+    async def add(
+            self,
+            db: AsyncSession,
+            post_id: int,
+            state: Dict[str, Any],
+            previous: Optional[Dict[str, Any]] = None,
+            snapshot_interval: int = 10,
+    ) -> int:
+        """
+        Stage the next revision of a post in the caller's transaction.
+
+        Every ``snapshot_interval``-th revision is a full snapshot, the rest are
+        deltas against ``previous``, so reading any revision applies fewer than
+        ``snapshot_interval`` deltas. Posts saved before revisions existed get
+        ``previous`` recorded as their first snapshot. Callers read ``previous``
+        with the post row already locked, so it is the state of the latest revision.
+        """
+        # Serialises concurrent saves of the same post so revision numbers don't collide
+        await db.execute(select(Post.id).where(Post.id == post_id).with_for_update())
+        result = await db.execute(
+            select(func.max(PostRevision.revision)).where(PostRevision.post_id == post_id)
+        )
+        latest = result.scalar_one() or 0
+        if latest == 0 and previous is not None:
+            db.add(PostRevision(post_id=post_id, revision=1, is_snapshot=True, data=pack(previous)))
+            latest = 1
+
+        revision = latest + 1
+        is_snapshot = previous is None or (revision - 1) % snapshot_interval == 0
+        data = pack(state if is_snapshot else make_delta(previous, state))
+        db.add(PostRevision(post_id=post_id, revision=revision, is_snapshot=is_snapshot, data=data))
+        return revision
+
+    async def get_multi_by_post(
+            self, db: AsyncSession, post_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Revision metadata, newest first"""
+        result = await db.execute(
+            select(
+                PostRevision.revision,
+                PostRevision.is_snapshot,
+                func.length(PostRevision.data).label("stored_bytes"),
+                PostRevision.created_at,
+            )
+            .where(PostRevision.post_id == post_id)
+            .order_by(PostRevision.revision.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in result]
+
+    async def get_version(
+            self, db: AsyncSession, post_id: int, revision: int
+    ) -> Optional[Dict[str, Any]]:
+        """Rebuild one revision from the nearest snapshot at or before it"""
+        snapshot = (
+            select(func.max(PostRevision.revision))
+            .where(
+                PostRevision.post_id == post_id,
+                PostRevision.is_snapshot == True,
+                PostRevision.revision <= revision,
+            )
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(PostRevision.revision, PostRevision.data, PostRevision.created_at)
+            .where(
+                PostRevision.post_id == post_id,
+                PostRevision.revision >= snapshot,
+                PostRevision.revision <= revision,
+            )
+            .order_by(PostRevision.revision)
+        )
+        rows = result.all()
+        if not rows or rows[-1].revision != revision:
+            return None
+
+        state = unpack(rows[0].data)
+        for row in rows[1:]:
+            state = apply_delta(state, unpack(row.data))
+        return {**state, "revision": revision, "created_at": rows[-1].created_at}
+
+
+post_revision = CRUDPostRevision()
@@ -0,0 +1,71 @@
+from typing import Dict, List, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func
+from app.crud.crud_user_stats import user_stats
+from app.db.upsert import upsert_increment
+from app.models.post import Post
+from app.models.post_view import PostViewBucket
+
+
+class CRUDPostView:
+    async def add_counts(
+            self, db: AsyncSession, counts: Dict[Tuple[int, datetime], int]
+    ) -> None:
+        """
+        Write buffered (post_id, hour) -> views counts in one transaction.
+
+        The hourly buckets get one upsert and the authors' total_views another,
+        so a GET never writes the author's stats row. Views of posts deleted
+        since they were buffered are dropped; the posts left are share-locked
+        so a purge can't remove them before the upsert.
+        """
+        result = await db.execute(
+            select(Post.id)
+            .where(Post.id.in_({post_id for post_id, _ in counts}))
+            .with_for_update(read=True)
+        )
+        existing = set(result.scalars().all())
+        counts = {key: count for key, count in counts.items() if key[0] in existing}
+        views: Dict[int, int] = {}
+        for (post_id, _), count in counts.items():
+            views[post_id] = views.get(post_id, 0) + count
+        await user_stats.apply_by_post(db, "total_views", views)
+        rows = [
+            {"post_id": post_id, "hour": hour, "count": count}
+            for (post_id, hour), count in counts.items()
+        ]
+        await upsert_increment(
+            db,
+            PostViewBucket.__table__,
+            rows,
+            key_columns=("post_id", "hour"),
+            counter_columns=("count",),
+        )
+        await db.commit()
+
+    async def get_top_posts(
+            self, db: AsyncSession, since: datetime, limit: int = 50
+    ) -> List[Tuple[int, int]]:
+        """Return (post_id, views) for the most viewed published posts since ``since``"""
+        views = func.sum(PostViewBucket.count).label("views")
+        result = await db.execute(
+            select(PostViewBucket.post_id, views)
+            .join(Post, Post.id == PostViewBucket.post_id)
+            .where(PostViewBucket.hour >= since, Post.is_published == True)
+            .group_by(PostViewBucket.post_id)
+            .order_by(views.desc())
+            .limit(limit)
+        )
+        return [(row.post_id, int(row.views)) for row in result]
+
+    async def prune(self, db: AsyncSession, before: datetime) -> int:
+        """Delete buckets older than ``before``"""
+        result = await db.execute(
+            delete(PostViewBucket).where(PostViewBucket.hour < before)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+post_view = CRUDPostView()
@@ -0,0 +1,93 @@
+import re
+from typing import Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func
+from app.config import settings
+from app.db.upsert import insert_ignore
+from app.models.post import Post
+from app.models.tag import Tag, post_tags
+from app.schemas.tag import TagCount
+from app.utils.cache import get_cache
+
+tag_cloud_cache = get_cache("tags", ttl=settings.TAG_CLOUD_CACHE_TTL_SECONDS, maxsize=32)
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")[:50]
+
+
+def parse_tag_list(value: str) -> List[str]:
+    """Slugs from a comma-separated query parameter, in order and without duplicates"""
+    return list(dict.fromkeys(slug for slug in map(slugify, value.split(",")) if slug))
+
+
+class CRUDTag:
+    async def get_by_slugs(self, db: AsyncSession, slugs: List[str]) -> List[Tag]:
+        if not slugs:
+            return []
+        result = await db.execute(select(Tag).where(Tag.slug.in_(slugs)))
+        return list(result.scalars().all())
+
+    async def set_post_tags(self, db: AsyncSession, post_id: int, names: List[str]) -> None:
+        """
+        Replace a post's tags without committing.
+
+        Missing tags are created with one insert-or-ignore, links no longer
+        wanted are removed with one DELETE, and new links are added with one
+        insert-or-ignore, so unchanged links are never rewritten.
+        """
+        wanted: Dict[str, str] = {}
+        for name in names:
+            slug = slugify(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name.strip()[:50]
+
+        tag_ids: List[int] = []
+        if wanted:
+            await insert_ignore(
+                db,
+                Tag.__table__,
+                [{"name": name, "slug": slug} for slug, name in wanted.items()],
+                key_columns=("slug",),
+            )
+            result = await db.execute(select(Tag.id).where(Tag.slug.in_(wanted)))
+            tag_ids = list(result.scalars().all())
+
+        unlink = delete(post_tags).where(post_tags.c.post_id == post_id)
+        if tag_ids:
+            unlink = unlink.where(post_tags.c.tag_id.not_in(tag_ids))
+        await db.execute(unlink)
+        await insert_ignore(
+            db,
+            post_tags,
+            [{"post_id": post_id, "tag_id": tag_id} for tag_id in tag_ids],
+            key_columns=("post_id", "tag_id"),
+        )
+
+    async def get_cloud(self, db: AsyncSession, limit: int = 100) -> List[TagCount]:
+        """
+        Tags with their number of published posts, most used first; cached for a short TTL.
+
+        Writers that change a post's tags, ``is_published`` or ``deleted_at`` invalidate
+        the "tags" group after they commit.
+        """
+        cached = tag_cloud_cache.get(limit)
+        if cached is not None:
+            return cached
+
+        post_count = func.count(post_tags.c.post_id).label("post_count")
+        result = await db.execute(
+            select(Tag.id, Tag.name, Tag.slug, post_count)
+            .join(post_tags, post_tags.c.tag_id == Tag.id)
+            .join(Post, Post.id == post_tags.c.post_id)
+            .where(Post.is_published == True)
+            .group_by(Tag.id, Tag.name, Tag.slug)
+            .order_by(post_count.desc(), Tag.slug)
+            .limit(limit)
+        )
+        cloud = [TagCount.model_validate(row._mapping) for row in result]
+        tag_cloud_cache.set(limit, cloud)
+        return cloud
+
+
+tag = CRUDTag()
@@ -1,32 +1,146 @@
-from typing import Optional
+from typing import Optional, Any, Dict
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, exists
+from app.config import settings
+from app.core.security import hash_password, verify_and_update
 from app.crud.base import CRUDBase
+from app.crud.crud_comment import comment as crud_comment
+from app.crud.crud_comment_archive import comment_archive as crud_comment_archive
+from app.crud.crud_post import post as crud_post
+from app.models.comment import Comment
+from app.models.comment_archive import CommentArchiveAuthor
+from app.models.post import Post
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.utils.cache import get_cache
+
+# Short-lived per-worker cache used by get_current_user; other workers see
+# updates once the TTL expires.
+user_cache = get_cache("users", ttl=settings.USER_CACHE_TTL_SECONDS, maxsize=10000)
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
-        result = await db.execute(select(User).where(User.email == email))
+    async def get_cached(self, db: AsyncSession, id: int) -> Optional[UserResponse]:
+        """Session-independent snapshot of a user, served from the user cache when possible"""
+        snapshot = user_cache.get(id)
+        if snapshot is None:
+            db_obj = await self.get(db=db, id=id)
+            if db_obj is None:
+                return None
+            snapshot = UserResponse.model_validate(db_obj)
+            user_cache.set(id, snapshot)
+        return snapshot
+
+    async def get_by_email(self, db: AsyncSession, email: str, include_deleted: bool = False) -> Optional[User]:
+        """``include_deleted`` for uniqueness checks: a deleted user keeps its email until purged"""
+        result = await db.execute(
+            select(User).where(User.email == email).execution_options(include_deleted=include_deleted)
+        )
         return result.scalar_one_or_none()
 
-    async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
-        result = await db.execute(select(User).where(User.username == username))
+    async def get_by_username(self, db: AsyncSession, username: str, include_deleted: bool = False) -> Optional[User]:
+        result = await db.execute(
+            select(User).where(User.username == username).execution_options(include_deleted=include_deleted)
+        )
         return result.scalar_one_or_none()
 
     async def create(self, db: AsyncSession, obj_in: UserCreate) -> User:
-        # TODO: Hash password here (will implement in security phase)
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
             full_name=obj_in.full_name,
-            hashed_password=obj_in.password,  # Temporary: storing plain password
+            hashed_password=await hash_password(obj_in.password),
         )
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def update(
+            self, db: AsyncSession, id: int, obj_in: UserUpdate | Dict[str, Any]
+    ) -> Optional[User]:
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        password = update_data.pop("password", None)
+        if password:
+            update_data["hashed_password"] = await hash_password(password)
+
+        db_obj = await super().update(db=db, id=id, obj_in=update_data)
+        # After the commit: evicting earlier lets a concurrent read cache the old row again
+        user_cache.delete(id)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, id: int) -> Optional[User]:
+        """
+        Soft delete the user with their comments and posts, in a few bulk UPDATEs.
+
+        Nothing is loaded into the session; the purger removes the rows later.
+        """
+        db_obj = await self.get(db=db, id=id)
+        if not db_obj:
+            return None
+        now = datetime.utcnow()
+        await crud_comment.soft_delete_by_author(db, author_id=id, now=now)
+        await crud_post.soft_delete_where(db, Post.author_id == id, now=now)
+        await db.execute(
+            update(User).where(User.id == id).values(deleted_at=now).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        user_cache.delete(id)
+        return db_obj
+
+    async def purge_deleted(self, db: AsyncSession, before: datetime, limit: int = 500) -> int:
+        """
+        Hard-delete up to ``limit`` users soft-deleted before ``before`` whose posts and comments are purged.
+
+        Their archived comments, which the comment purger can't reach, are dropped from the archive first.
+        """
+        result = await db.execute(
+            select(User.id)
+            .where(
+                User.deleted_at < before,
+                ~exists().where(Post.author_id == User.id),
+                ~exists().where(Comment.author_id == User.id),
+            )
+            .order_by(User.deleted_at)
+            .limit(limit)
+            .execution_options(include_deleted=True)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            await db.rollback()
+            return 0
+        result = await db.execute(
+            select(CommentArchiveAuthor.author_id.distinct()).where(CommentArchiveAuthor.author_id.in_(ids))
+        )
+        for author_id in result.scalars().all():
+            await crud_comment_archive.purge_author(db=db, author_id=author_id)
+        await db.execute(delete(User).where(User.id.in_(ids)).execution_options(synchronize_session=False))
+        await db.commit()
+        return len(ids)
+
+    async def authenticate(
+            self, db: AsyncSession, username: str, password: str
+    ) -> Optional[User]:
+        """Check credentials, upgrading the stored hash if the hashing parameters changed"""
+        db_obj = await self.get_by_username(db=db, username=username)
+        if not db_obj:
+            db_obj = await self.get_by_email(db=db, email=username)
+        if not db_obj:
+            return None
+
+        verified, new_hash = await verify_and_update(password, db_obj.hashed_password)
+        if not verified:
+            return None
+        if new_hash:
+            db_obj.hashed_password = new_hash
+            await db.commit()
+            user_cache.delete(db_obj.id)
+        return db_obj
+
 
 user = CRUDUser(User)
@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case
+from app.db.upsert import upsert, upsert_increment
+from app.models.post import Post
+from app.models.user import User
+from app.models.user_stats import UserStats
+
+COUNTERS = ("post_count", "published_count", "draft_count", "total_views", "comment_count")
+
+
+def post_deltas(is_published: bool, sign: int = 1) -> Dict[str, int]:
+    """Counter deltas for adding (``sign=1``) or removing (``sign=-1``) one post"""
+    return {"post_count": sign, "published_count" if is_published else "draft_count": sign}
+
+
+class CRUDUserStats:
+    """
+    Materialized per-author totals in user_stats.
+
+    Writers call ``apply`` inside their own transaction, before committing, so
+    counters move together with the rows they count. ``reconcile_range``
+    recomputes a range of users from ``posts`` to correct any drift.
+    """
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[UserStats]:
+        result = await db.execute(select(UserStats).where(UserStats.user_id == user_id))
+        return result.scalar_one_or_none()
+
+    async def apply(self, db: AsyncSession, deltas: Dict[int, Dict[str, int]]) -> None:
+        """Add per-user counter deltas (``{user_id: {counter: delta}}``) with one upsert; doesn't commit"""
+        rows = [
+            {"user_id": user_id, **{counter: changes.get(counter, 0) for counter in COUNTERS}}
+            for user_id, changes in deltas.items()
+            if any(changes.values())
+        ]
+        await upsert_increment(
+            db, UserStats.__table__, rows, key_columns=("user_id",), counter_columns=COUNTERS,
+        )
+
+    async def apply_by_post(self, db: AsyncSession, counter: str, deltas: Dict[int, int]) -> None:
+        """Add per-post deltas of one counter (``{post_id: delta}``) onto the posts' authors"""
+        deltas = {post_id: delta for post_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        result = await db.execute(select(Post.id, Post.author_id).where(Post.id.in_(deltas)))
+        by_author: Dict[int, Dict[str, int]] = {}
+        for post_id, author_id in result:
+            changes = by_author.setdefault(author_id, {counter: 0})
+            changes[counter] += deltas[post_id]
+        # Author id order, so concurrent batches lock user_stats rows in the same order
+        await self.apply(db, dict(sorted(by_author.items())))
+
+    async def reconcile_range(
+            self, db: AsyncSession, after_user_id: int = 0, limit: int = 500
+    ) -> Tuple[Optional[int], int, int]:
+        """
+        Recompute the stats of the next ``limit`` users after ``after_user_id``.
+
+        The user_stats range is locked before ``posts`` is aggregated, so a writer
+        either committed before the aggregate read or applies its delta on top of
+        the corrected row afterwards. Both reads before the aggregate are locking
+        reads: under REPEATABLE READ the first plain read fixes the snapshot, and
+        it must not predate the lock, or a writer committing in between would have
+        its delta in the locked row but not in the aggregate, and lose it.
+        total_views is the one counter applied later than its source: views
+        reach posts.view_count on each GET but total_views only in the view
+        flush. A sweep between the two sets total_views to include the views
+        still buffered, and the flush then adds them again. The overshoot is at
+        most one flush interval of views, and the next sweep corrects it.
+        Returns the last user id checked (None once past the end), the number of
+        users checked and the number that had drifted.
+        """
+        result = await db.execute(
+            select(User.id)
+            .where(User.id > after_user_id)
+            .order_by(User.id)
+            .limit(limit)
+            .with_for_update(read=True)
+        )
+        user_ids = list(result.scalars().all())
+        if not user_ids:
+            await db.rollback()
+            return None, 0, 0
+        low, high = user_ids[0], user_ids[-1]
+
+        result = await db.execute(
+            select(UserStats)
+            .where(UserStats.user_id >= low, UserStats.user_id <= high)
+            .with_for_update()
+        )
+        stored = {row.user_id: row for row in result.scalars().all()}
+
+        result = await db.execute(
+            select(
+                Post.author_id,
+                func.count(),
+                func.sum(case((Post.is_published == True, 1), else_=0)),
+                func.sum(Post.view_count),
+                func.sum(Post.approved_comment_count),
+            )
+            .where(Post.author_id >= low, Post.author_id <= high)
+            .group_by(Post.author_id)
+        )
+        actual = {
+            author_id: {
+                "post_count": posts,
+                "published_count": int(published),
+                "draft_count": posts - int(published),
+                "total_views": int(views),
+                "comment_count": int(comments),
+            }
+            for author_id, posts, published, views, comments in result
+        }
+
+        rows: List[Dict[str, int]] = []
+        for user_id in user_ids:
+            counters = actual.get(user_id, dict.fromkeys(COUNTERS, 0))
+            current = stored.get(user_id)
+            if current is None and not any(counters.values()):
+                continue
+            if current is None or any(getattr(current, name) != value for name, value in counters.items()):
+                rows.append({"user_id": user_id, **counters})
+        await upsert(db, UserStats.__table__, rows, key_columns=("user_id",), update_columns=COUNTERS)
+        await db.commit()
+        return high, len(user_ids), len(rows)
+
+
+user_stats = CRUDUserStats()
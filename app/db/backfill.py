@@ -0,0 +1,34 @@
+"""
+Data backfills that need application code and so can't run inside a migration
+
+    python -m app.db.backfill rendered
+"""
+import asyncio
+import sys
+from app.core import rendering
+from app.crud import post as crud_post
+from app.db.session import AsyncSessionLocal, async_engine
+
+
+async def backfill_rendered() -> None:
+    async with AsyncSessionLocal() as session:
+        total = await crud_post.render_missing(db=session)
+    print(f"Rendered {total} posts")
+
+
+BACKFILLS = {"rendered": backfill_rendered}
+
+
+async def main(name: str) -> None:
+    try:
+        await BACKFILLS[name]()
+    finally:
+        rendering.shutdown_executor()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in BACKFILLS:
+        print(f"usage: python -m app.db.backfill [{'|'.join(BACKFILLS)}]")
+        sys.exit(1)
+    asyncio.run(main(sys.argv[1]))
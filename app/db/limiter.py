@@ -0,0 +1,44 @@
+"""
+Load shedding for database work
+
+Requests hold a slot for the lifetime of their session. When every slot is
+taken, up to ``max_queue`` requests wait (at most ``queue_timeout`` seconds);
+anything beyond that is rejected immediately with 503 + Retry-After instead
+of piling up behind the connection pool until it times out.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from app.utils.exceptions import ServiceUnavailableException
+
+
+class DBConcurrencyLimiter:
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float, retry_after: int = 1):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise ServiceUnavailableException(retry_after=self.retry_after)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise ServiceUnavailableException(retry_after=self.retry_after)
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        try:
+            yield
+        finally:
+            self._semaphore.release()
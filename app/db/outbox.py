@@ -0,0 +1,85 @@
+"""
+Captures content changes into the outbox as part of the flush that makes them
+
+The listener runs inside the writing transaction, so an outbox row exists if
+and only if the change committed. Bulk UPDATE/DELETE statements bypass the
+unit of work and call ``record_events`` explicitly.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.outbox import OutboxEvent
+from app.models.post import Post
+
+TRACKED_MODELS = {Post: "post", Comment: "comment", Category: "category"}
+
+# Counters that change on reads or as side effects; not worth an event on their own
+IGNORED_FIELDS = {"view_count", "approved_comment_count", "updated_at"}
+
+
+def build_event(
+        aggregate_type: str, aggregate_id: int, event_type: str, fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"id": aggregate_id}
+    if fields:
+        payload["fields"] = fields
+    now = datetime.utcnow()
+    return {
+        "aggregate_type": aggregate_type,
+        "aggregate_id": aggregate_id,
+        "event_type": event_type,
+        "payload": payload,
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+    }
+
+
+def _changed_fields(obj) -> List[str]:
+    state = inspect(obj)
+    return [
+        column.key for column in state.mapper.column_attrs
+        if column.key not in IGNORED_FIELDS and state.attrs[column.key].history.has_changes()
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def capture_changes(session: Session, flush_context) -> None:
+    if not settings.OUTBOX_ENABLED:
+        return
+
+    rows = []
+    for obj in session.new:
+        aggregate_type = TRACKED_MODELS.get(type(obj))
+        if aggregate_type:
+            rows.append(build_event(aggregate_type, obj.id, "created"))
+    for obj in session.dirty:
+        aggregate_type = TRACKED_MODELS.get(type(obj))
+        if aggregate_type:
+            fields = _changed_fields(obj)
+            if fields:
+                rows.append(build_event(aggregate_type, obj.id, "updated", fields))
+    for obj in session.deleted:
+        aggregate_type = TRACKED_MODELS.get(type(obj))
+        if aggregate_type:
+            rows.append(build_event(aggregate_type, obj.id, "deleted"))
+
+    if rows:
+        session.connection().execute(insert(OutboxEvent.__table__), rows)
+
+
+async def record_events(
+        db: AsyncSession, aggregate_type: str, ids: Iterable[int], event_type: str,
+        fields: Optional[List[str]] = None,
+) -> None:
+    """Add outbox rows for changes made with bulk statements; committed with the caller's transaction"""
+    if not settings.OUTBOX_ENABLED:
+        return
+    rows = [build_event(aggregate_type, id, event_type, fields) for id in ids]
+    if rows:
+        await db.execute(insert(OutboxEvent.__table__), rows)
@@ -1,12 +1,69 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from typing import Any, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from app.config import settings
+from app.db.limiter import DBConcurrencyLimiter
+from app.db import outbox  # noqa: F401  registers the outbox flush listener
+
+
+def resolve_pool_limits() -> Tuple[int, int]:
+    """
+    Pool size and overflow for this process.
+
+    With DB_CONNECTION_BUDGET set, the budget is split evenly across the
+    WEB_WORKERS processes; up to DB_POOL_SIZE of a process's share is kept
+    open and the remainder is overflow.
+    """
+    if not settings.DB_CONNECTION_BUDGET:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    share = max(settings.DB_CONNECTION_BUDGET // (settings.WEB_WORKERS or 1), 1)
+    pool_size = min(settings.DB_POOL_SIZE, share)
+    return pool_size, share - pool_size
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # Let SQLAlchemy emit BEGIN itself; the driver's implicit transactions break SAVEPOINT
+    dbapi_connection.isolation_level = None
+    # Enforce ON DELETE CASCADE like InnoDB, and wait for the write lock instead of failing
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _begin_sqlite(connection) -> None:
+    connection.exec_driver_sql("BEGIN")
+
+
+def create_db_engine(
+        url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None, **kwargs: Any
+) -> AsyncEngine:
+    """
+    Async engine for MySQL, or for SQLite (aiosqlite) in tests, benchmarks and local runs.
+
+    SQLite picks its own pool (a single shared connection for in-memory
+    databases), so pool sizing only applies to server databases.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        engine = create_async_engine(url, **kwargs)
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        event.listen(engine.sync_engine, "begin", _begin_sqlite)
+        return engine
+    if pool_size is not None:
+        kwargs.update(pool_size=pool_size, max_overflow=max_overflow or 0)
+    return create_async_engine(url, pool_pre_ping=True, **kwargs)
+
+
+pool_size, max_overflow = resolve_pool_limits()
 
 # Async engine for database operations
-async_engine = create_async_engine(
+async_engine = create_db_engine(
     settings.DATABASE_URL,
+    pool_size=pool_size,
+    max_overflow=max_overflow,
     echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,
 )
 
 # Async session factory
@@ -18,9 +75,17 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Request sessions beyond what the pool can serve queue here, and are shed once the queue is full
+db_limiter = DBConcurrencyLimiter(
+    max_concurrency=pool_size + max_overflow,
+    max_queue=settings.DB_MAX_QUEUE,
+    queue_timeout=settings.DB_QUEUE_TIMEOUT_SECONDS,
+)
+
 async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+    async with db_limiter.slot():
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+            finally:
+                await session.close()
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Soft delete: rows are marked with ``deleted_at`` and purged later in batches
+
+Every ORM SELECT issued through a Session excludes soft-deleted rows of
+SoftDeleteMixin models, including relationship loads and joins. Queries
+that need to see them (uniqueness checks, the purger) opt out with
+``.execution_options(include_deleted=True)``.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Mapped, ORMExecuteState, Session, mapped_column, with_loader_criteria
+from app.db.types import DateTime
+
+
+class SoftDeleteMixin:
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def exclude_soft_deleted(state: ORMExecuteState) -> None:
+    if (
+            state.is_select
+            and not state.is_column_load
+            and not state.is_relationship_load
+            and not state.execution_options.get("include_deleted", False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
@@ -0,0 +1,13 @@
+"""
+Column types that behave the same on MySQL and SQLite
+"""
+from sqlalchemy import DateTime as _DateTime
+from sqlalchemy.dialects import sqlite
+
+# MySQL DATETIME (and SQLite's CURRENT_TIMESTAMP default) keep whole seconds. Store
+# Python-side values in SQLite the same way, so keyset cursors and equality
+# comparisons see the same values on both.
+DateTime = _DateTime().with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
@@ -0,0 +1,92 @@
+"""
+Dialect-aware bulk upsert statements (MySQL in production, SQLite/PostgreSQL elsewhere)
+"""
+from typing import Any, Dict, List, Sequence
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def upsert_increment(
+        db: AsyncSession,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        key_columns: Sequence[str],
+        counter_columns: Sequence[str],
+) -> None:
+    """Insert ``rows`` in one statement, adding ``counter_columns`` onto rows that already exist"""
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            {column: table.c[column] + stmt.inserted[column] for column in counter_columns}
+        )
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: table.c[column] + stmt.excluded[column] for column in counter_columns},
+        )
+    await db.execute(stmt)
+
+
+async def upsert(
+        db: AsyncSession,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        key_columns: Sequence[str],
+        update_columns: Sequence[str],
+) -> None:
+    """Insert ``rows`` in one statement, overwriting ``update_columns`` of rows that already exist"""
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+    await db.execute(stmt)
+
+
+async def insert_ignore(
+        db: AsyncSession,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        key_columns: Sequence[str],
+) -> None:
+    """Insert ``rows`` in one statement, skipping rows whose key already exists"""
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        # No-op update rather than INSERT IGNORE, which would also hide other errors
+        key = key_columns[0]
+        stmt = stmt.on_duplicate_key_update({key: table.c[key]})
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows).on_conflict_do_nothing(index_elements=list(key_columns))
+    await db.execute(stmt)
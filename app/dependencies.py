@@ -2,8 +2,18 @@
 Dependency injection functions for FastAPI
 """
 from typing import AsyncGenerator
+from fastapi import Depends
+from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import AsyncSessionLocal
+from app.config import settings
+from app.core.security import decode_access_token
+from app.crud import user as crud_user
+from app.db.session import AsyncSessionLocal, get_db as get_session
+from app.schemas.user import UserResponse
+from app.utils.exceptions import UnauthorizedException, ForbiddenException
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/token")
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -16,4 +26,34 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_session)
+) -> UserResponse:
+    """
+    Resolve the bearer token to a user.
+
+    The signature is checked locally and the user comes from the short-TTL
+    user cache, so most authenticated requests do not query the users table.
+    """
+    user_id = decode_access_token(token)
+    if user_id is None:
+        raise UnauthorizedException(detail="Could not validate credentials")
+
+    user = await crud_user.get_cached(db=db, id=user_id)
+    if not user:
+        raise UnauthorizedException(detail="Could not validate credentials")
+    if not user.is_active:
+        raise ForbiddenException(detail="Inactive user")
+    return user
+
+
+async def get_current_superuser(
+        current_user: UserResponse = Depends(get_current_user)
+) -> UserResponse:
+    if not current_user.is_superuser:
+        raise ForbiddenException(detail="Superuser privileges required")
+    return current_user
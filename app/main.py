@@ -1,16 +1,49 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.api.v1.router import api_router
+from app.api.v1.endpoints import feeds
+from app.api.v1.router import include_api_routers
+from app.core import rendering, security
+from app.db.session import async_engine
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.workers import get_enabled_workers
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start background workers (scheduled publishing, ...)
+    workers = get_enabled_workers()
+    for worker in workers:
+        worker.start()
+    yield
+    for worker in workers:
+        await worker.stop()
+    security.shutdown_executor()
+    rendering.shutdown_executor()
+    await async_engine.dispose()
+
+
+openapi_enabled = settings.DEBUG if settings.OPENAPI_ENABLED is None else settings.OPENAPI_ENABLED
+
+# The schema itself is generated on the first /openapi.json request, never at startup
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="Blog CMS API with FastAPI",
-    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json" if openapi_enabled else None,
+    lifespan=lifespan,
 )
 
-# CORS configuration
+# Imported only when enabled, so a disabled profiler adds no code to the request path
+if settings.PROFILING_ENABLED:
+    from app.middleware.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# CORS configuration (added last so it wraps rate-limit responses too)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify exact origins
@@ -19,16 +52,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API router
-app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+# Include API routers
+include_api_routers(app, prefix=settings.API_V1_PREFIX)
+# /sitemap.xml, /sitemaps/posts-{n}.xml and /feed.xml live at the site root
+app.include_router(feeds.router, tags=["feeds"])
 
 @app.get("/")
 async def root():
     return {
         "message": "Welcome to Blog CMS API",
         "version": settings.VERSION,
-        "docs": "/docs",
-        "redoc": "/redoc"
+        "docs": "/docs" if openapi_enabled else None,
+        "redoc": "/redoc" if openapi_enabled else None
     }
 
 @app.get("/health")
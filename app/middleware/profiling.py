@@ -0,0 +1,98 @@
+"""
+On-demand request profiling
+
+Profiles a request when a superuser sends the PROFILING_HEADER, or when it
+is picked by PROFILING_SAMPLE_RATE. The profile id is returned in the
+``X-Profile-Id`` response header and the profile is listed under
+``/system/profiles``. The middleware is only installed when
+PROFILING_ENABLED is set, so it costs nothing otherwise.
+"""
+import random
+import time
+from datetime import datetime
+from app.config import settings
+from app.core.profiling import RequestProfiler, ProfileStore, profile_store, resolve_backend
+from app.core.security import decode_access_token
+from app.utils.logger import get_logger
+
+logger = get_logger("middleware.profiling")
+
+
+class ProfilingMiddleware:
+    """Captures a CPU profile or async call tree for flagged and sampled requests"""
+
+    def __init__(self, app, store: ProfileStore = profile_store, sample_rate: float = None):
+        self.app = app
+        self.store = store
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.header = settings.PROFILING_HEADER.lower().encode("latin-1")
+        self.backend = resolve_backend()
+        # Profilers hook the whole interpreter: one profiled request per worker at a time
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        trigger = None
+        if self.header in dict(scope["headers"]) and await self.is_superuser(scope):
+            trigger = "header"
+        elif self.sample_rate and random.random() < self.sample_rate:
+            trigger = "sample"
+        if trigger is None or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        profile_id = self.store.new_id()
+        status_code = 500
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())],
+                }
+            await send(message)
+
+        profiler = RequestProfiler(self.backend)
+        started = time.perf_counter()
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profiler.stop()
+            duration = time.perf_counter() - started
+            await self.store.save(profile_id, profiler, {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "trigger": trigger,
+                "backend": self.backend,
+                "created_at": datetime.utcnow().isoformat(),
+            })
+        except Exception:
+            logger.exception("profiling %s %s failed", scope["method"], scope["path"])
+            raise
+        finally:
+            self._busy = False
+
+    async def is_superuser(self, scope) -> bool:
+        """Only superusers may request a profile; the header is ignored for everyone else"""
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        if not authorization.lower().startswith("bearer "):
+            return False
+        user_id = decode_access_token(authorization[7:])
+        if user_id is None:
+            return False
+        from app.crud import user as crud_user
+        from app.db.session import AsyncSessionLocal
+        async with AsyncSessionLocal() as db:
+            user = await crud_user.get_cached(db=db, id=user_id)
+        return user is not None and user.is_active and user.is_superuser
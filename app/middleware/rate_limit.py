@@ -0,0 +1,178 @@
+"""
+Per-client token-bucket rate limiting
+
+Requests are classified into route groups (auth, write, read), each with its
+own refill rate and burst. Buckets live in a pluggable backend: in-memory
+per worker by default, or Redis so all workers share one budget.
+"""
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from app.config import settings
+from app.core.security import decode_access_token
+
+
+@dataclass(frozen=True)
+class RouteGroup:
+    name: str
+    rate: float  # tokens per second
+    burst: int
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def consume(self, key: str, group: RouteGroup, cost: int = 1) -> Tuple[bool, float]:
+        """Take ``cost`` tokens; return (allowed, seconds until enough tokens are available)"""
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Buckets kept in this worker's memory, evicting the least recently used keys"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def consume(self, key: str, group: RouteGroup, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(group.burst), now))
+        tokens = min(float(group.burst), tokens + (now - updated_at) * group.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / group.rate
+
+
+class RedisBackend(RateLimitBackend):
+    """Buckets shared by every worker, updated atomically by a Lua script"""
+
+    SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 't'))
+    local updated_at = tonumber(redis.call('HGET', KEYS[1], 'u'))
+    local rate, burst, now, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    if tokens == nil then tokens = burst; updated_at = now end
+    tokens = math.min(burst, tokens + (now - updated_at) * rate)
+    local allowed = 0
+    if tokens >= cost then tokens = tokens - cost; allowed = 1 end
+    redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from exc
+        self._redis = redis_asyncio.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+
+    async def consume(self, key: str, group: RouteGroup, cost: int = 1) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(
+            keys=[f"ratelimit:{key}"],
+            args=[group.rate, group.burst, time.time(), cost],
+        )
+        if allowed:
+            return True, 0.0
+        return False, (cost - float(tokens)) / group.rate
+
+
+def get_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    return InMemoryBackend()
+
+
+def default_route_groups() -> Dict[str, RouteGroup]:
+    return {
+        "auth": RouteGroup("auth", settings.RATE_LIMIT_AUTH_RATE, settings.RATE_LIMIT_AUTH_BURST),
+        "write": RouteGroup("write", settings.RATE_LIMIT_WRITE_RATE, settings.RATE_LIMIT_WRITE_BURST),
+        "read": RouteGroup("read", settings.RATE_LIMIT_READ_RATE, settings.RATE_LIMIT_READ_BURST),
+    }
+
+
+class RateLimitMiddleware:
+    """Rejects requests over their client's budget with 429 and Retry-After"""
+
+    WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(
+            self,
+            app,
+            backend: Optional[RateLimitBackend] = None,
+            groups: Optional[Dict[str, RouteGroup]] = None,
+            exempt_paths: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.backend = backend or get_backend()
+        self.groups = groups or default_route_groups()
+        self.exempt_paths = set(exempt_paths or ["/health"])
+        self.auth_prefix = f"{settings.API_V1_PREFIX}/auth"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        group = self.classify(scope)
+        key = f"{group.name}:{self.client_key(scope)}"
+        allowed, retry_after = await self.backend.consume(key, group, self.cost(scope, group))
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def classify(self, scope) -> RouteGroup:
+        if scope["path"].startswith(self.auth_prefix):
+            return self.groups["auth"]
+        if scope["method"] in self.WRITE_METHODS:
+            return self.groups["write"]
+        return self.groups["read"]
+
+    def client_key(self, scope) -> str:
+        """Authenticated user id when a valid bearer token is present, else the client address"""
+        headers = dict(scope["headers"])
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if authorization.lower().startswith("bearer "):
+            user_id = decode_access_token(authorization[7:])
+            if user_id is not None:
+                return f"user:{user_id}"
+
+        if settings.RATE_LIMIT_TRUST_FORWARDED and b"x-forwarded-for" in headers:
+            return "ip:" + headers[b"x-forwarded-for"].decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def cost(self, scope, group: RouteGroup) -> int:
+        """Deep offset pages cost more, so offset scraping drains the bucket faster"""
+        if group.name != "read" or not scope.get("query_string"):
+            return 1
+        skip = parse_qs(scope["query_string"].decode("latin-1")).get("skip")
+        try:
+            offset = int(skip[0]) if skip else 0
+        except ValueError:
+            offset = 0
+        return min(group.burst, 1 + offset // settings.RATE_LIMIT_OFFSET_COST_STEP)
@@ -2,5 +2,12 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.post import Post
 from app.models.comment import Comment
+from app.models.post_view import PostViewBucket
+from app.models.outbox import OutboxEvent
+from app.models.comment_archive import CommentArchive, CommentArchiveAuthor, CommentArchiveComment
+from app.models.post_revision import PostRevision
+from app.models.tag import Tag, post_tags
+from app.models.user_stats import UserStats
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ["User", "Category", "Post", "Comment"]
\ No newline at end of file
+__all__ = ["User", "Category", "Post", "Comment", "PostViewBucket", "OutboxEvent", "CommentArchive", "CommentArchiveAuthor", "CommentArchiveComment", "PostRevision", "Tag", "post_tags", "UserStats", "IdempotencyKey"]
\ No newline at end of file
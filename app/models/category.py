@@ -1,8 +1,9 @@
-from sqlalchemy import String, Text, DateTime, func
+from sqlalchemy import String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import List
 from app.db.base import Base
+from app.db.types import DateTime
 
 
 class Category(Base):
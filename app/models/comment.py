@@ -1,12 +1,18 @@
-from sqlalchemy import String, Text, Boolean, Integer, ForeignKey, DateTime, func
+from sqlalchemy import String, Text, Boolean, Integer, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import Optional
 from app.db.base import Base
+from app.db.soft_delete import SoftDeleteMixin
+from app.db.types import DateTime
 
 
-class Comment(Base):
+class Comment(SoftDeleteMixin, Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Moderation queue: keyset paging over pending comments, oldest first
+        Index("ix_comments_is_approved_created_at", "is_approved", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -19,7 +25,7 @@ class Comment(Base):
                                                  nullable=False)
 
     # Relationships
-    author: Mapped["User"] = relationship("User", back_populates="comments")
+    author: Mapped["User"] = relationship("User", back_populates="comments", lazy="selectin")
     post: Mapped["Post"] = relationship("Post", back_populates="comments")
     parent: Mapped[Optional["Comment"]] = relationship("Comment", remote_side=[id], back_populates="replies")
     replies: Mapped[list["Comment"]] = relationship("Comment", back_populates="parent")
@@ -0,0 +1,39 @@
+from sqlalchemy import Integer, ForeignKey, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base import Base
+from app.db.types import DateTime
+
+
+class CommentArchive(Base):
+    """zlib-compressed JSON list of archived comments for one post, in id order"""
+    __tablename__ = "comment_archives"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), index=True, nullable=False)
+    first_comment_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_comment_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # MEDIUMBLOB on MySQL; a chunk holds at most COMMENT_ARCHIVE_CHUNK_SIZE comments
+    data: Mapped[bytes] = mapped_column(LargeBinary(length=2 ** 24 - 1), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+
+class CommentArchiveAuthor(Base):
+    """Which authors have comments in an archive chunk, so their comments can be found without unpacking every chunk"""
+    __tablename__ = "comment_archive_authors"
+
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    archive_id: Mapped[int] = mapped_column(
+        ForeignKey("comment_archives.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+class CommentArchiveComment(Base):
+    """Which archive chunk holds each archived comment, so one comment is found by primary key"""
+    __tablename__ = "comment_archive_comments"
+
+    comment_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    archive_id: Mapped[int] = mapped_column(
+        ForeignKey("comment_archives.id", ondelete="CASCADE"), index=True, nullable=False
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import String, Integer, LargeBinary, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from typing import Optional
+from app.db.base import Base
+from app.db.types import DateTime
+
+
+class IdempotencyKey(Base):
+    """
+    A client's Idempotency-Key and the response of the request that first used it.
+
+    ``status_code`` is NULL while that request is still executing; the row
+    doubles as the cross-worker lock other requests with the key wait on.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Purge scans expired keys
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    scope: Mapped[str] = mapped_column(String(100), nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # zlib-compressed JSON body
+    response: Mapped[Optional[bytes]] = mapped_column(LargeBinary(length=16777215), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
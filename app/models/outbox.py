@@ -0,0 +1,25 @@
+from sqlalchemy import String, Text, Integer, JSON, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from typing import Optional
+from app.db.base import Base
+from app.db.types import DateTime
+
+
+class OutboxEvent(Base):
+    """Content change written in the same transaction as the change itself"""
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Dispatcher claims the oldest events that are due
+        Index("ix_outbox_events_next_attempt_at_id", "next_attempt_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    aggregate_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
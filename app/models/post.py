@@ -1,28 +1,44 @@
-from sqlalchemy import String, Text, Boolean, Integer, ForeignKey, DateTime, func
+from sqlalchemy import String, Text, Boolean, Integer, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import List, Optional
 from app.db.base import Base
+from app.db.soft_delete import SoftDeleteMixin
+from app.db.types import DateTime
 
 
-class Post(Base):
+class Post(SoftDeleteMixin, Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Range scan used by the scheduled publisher: is_published = 0 AND scheduled_at <= now
+        Index("ix_posts_is_published_scheduled_at", "is_published", "scheduled_at"),
+        # Newest-first scan of published posts for /feed.xml
+        Index("ix_posts_is_published_published_at", "is_published", "published_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     slug: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     excerpt: Mapped[str] = mapped_column(Text, nullable=True)
+    # Derived from content on every write
+    content_html: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    word_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reading_time_minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     is_published: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     view_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    approved_comment_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id"), nullable=True)
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(),
                                                  nullable=False)
 
     # Relationships
-    author: Mapped["User"] = relationship("User", back_populates="posts")
-    category: Mapped[Optional["Category"]] = relationship("Category", back_populates="posts")
+    author: Mapped["User"] = relationship("User", back_populates="posts", lazy="selectin")
+    category: Mapped[Optional["Category"]] = relationship("Category", back_populates="posts", lazy="selectin")
     comments: Mapped[List["Comment"]] = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    tags: Mapped[List["Tag"]] = relationship("Tag", secondary="post_tags", back_populates="posts", lazy="selectin",
+                                             order_by="Tag.slug")
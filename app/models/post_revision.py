@@ -0,0 +1,21 @@
+from sqlalchemy import Integer, Boolean, ForeignKey, LargeBinary, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base import Base
+from app.db.types import DateTime
+
+
+class PostRevision(Base):
+    """One saved version of a post, as a full snapshot or a delta against the previous revision"""
+    __tablename__ = "post_revisions"
+    __table_args__ = (
+        Index("ix_post_revisions_post_id_revision", "post_id", "revision", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    is_snapshot: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # zlib-compressed JSON, see app.core.revisions
+    data: Mapped[bytes] = mapped_column(LargeBinary(length=2 ** 24 - 1), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
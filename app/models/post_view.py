@@ -0,0 +1,18 @@
+from sqlalchemy import Integer, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base import Base
+from app.db.types import DateTime
+
+
+class PostViewBucket(Base):
+    """Per-post view count for one hour"""
+    __tablename__ = "post_view_buckets"
+    __table_args__ = (
+        # Window aggregation scans a range of hours and groups by post
+        Index("ix_post_view_buckets_hour_post_id", "hour", "post_id"),
+    )
+
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
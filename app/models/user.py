@@ -1,11 +1,13 @@
-from sqlalchemy import String, Boolean, DateTime, func
+from sqlalchemy import String, Boolean, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import List
 from app.db.base import Base
+from app.db.soft_delete import SoftDeleteMixin
+from app.db.types import DateTime
 
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Integer, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base import Base
+from app.db.types import DateTime
+
+
+class UserStats(Base):
+    """
+    Per-author dashboard totals, kept up to date by the post and comment write paths.
+
+    ``comment_count`` counts approved comments on the author's posts. Drift is
+    corrected by the periodic reconciler.
+    """
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    post_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    published_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    draft_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    total_views: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(),
+                                                 nullable=False)
@@ -1,11 +1,18 @@
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.schemas.post import PostCreate, PostUpdate, PostResponse
-from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
+from app.schemas.post import PostCreate, PostUpdate, PostResponse, PostRevisionSummary, PostRevisionResponse
+from app.schemas.comment import (
+    CommentCreate, CommentUpdate, CommentResponse, CommentPage, CommentModerate, CommentModerateResult,
+)
+from app.schemas.tag import TagResponse, TagCount, TagCloud
+from app.schemas.token import Token
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse",
     "CategoryCreate", "CategoryUpdate", "CategoryResponse",
-    "PostCreate", "PostUpdate", "PostResponse",
+    "PostCreate", "PostUpdate", "PostResponse", "PostRevisionSummary", "PostRevisionResponse",
     "CommentCreate", "CommentUpdate", "CommentResponse",
+    "CommentPage", "CommentModerate", "CommentModerateResult",
+    "TagResponse", "TagCount", "TagCloud",
+    "Token",
 ]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Literal
 from app.schemas.user import UserResponse
 
 
@@ -28,4 +28,19 @@ class CommentResponse(CommentBase):
     author: Optional[UserResponse] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
+
+
+class CommentModerate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=5000)
+    action: Literal["approve", "reject"]
+
+
+class CommentModerateResult(BaseModel):
+    action: Literal["approve", "reject"]
+    affected: int
@@ -1,8 +1,18 @@
-from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timezone
+from typing import Annotated, List, Optional
 from app.schemas.user import UserResponse
 from app.schemas.category import CategoryResponse
+from app.schemas.tag import TagResponse
+
+TagNames = List[Annotated[str, Field(min_length=1, max_length=50)]]
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Store timestamps as naive UTC, matching the DateTime columns"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
 class PostBase(BaseModel):
@@ -12,10 +22,13 @@ class PostBase(BaseModel):
     excerpt: Optional[str] = None
     is_published: bool = False
     category_id: Optional[int] = None
+    scheduled_at: Optional[datetime] = None
+
+    _normalize_scheduled_at = field_validator("scheduled_at")(to_naive_utc)
 
 
 class PostCreate(PostBase):
-    pass
+    tags: TagNames = Field(default_factory=list, max_length=20)
 
 
 class PostUpdate(BaseModel):
@@ -25,17 +38,40 @@ class PostUpdate(BaseModel):
     excerpt: Optional[str] = None
     is_published: Optional[bool] = None
     category_id: Optional[int] = None
+    scheduled_at: Optional[datetime] = None
+    tags: Optional[TagNames] = Field(None, max_length=20)
+
+    _normalize_scheduled_at = field_validator("scheduled_at")(to_naive_utc)
+
+
+class PostRevisionSummary(BaseModel):
+    revision: int
+    is_snapshot: bool
+    stored_bytes: int
+    created_at: datetime
+
+
+class PostRevisionResponse(BaseModel):
+    revision: int
+    title: str
+    content: str
+    excerpt: Optional[str] = None
+    created_at: datetime
 
 
 class PostResponse(PostBase):
     id: int
     view_count: int
+    approved_comment_count: int = 0
+    word_count: int = 0
+    reading_time_minutes: int = 0
     author_id: int
     published_at: Optional[datetime]
     created_at: datetime
     updated_at: datetime
     author: Optional[UserResponse] = None
     category: Optional[CategoryResponse] = None
+    tags: List[TagResponse] = []
 
     class Config:
         from_attributes = True
\ No newline at end of file
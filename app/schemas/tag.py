@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class TagResponse(BaseModel):
+    id: int
+    name: str
+    slug: str
+
+    class Config:
+        from_attributes = True
+
+
+class TagCount(TagResponse):
+    post_count: int
+
+
+class TagCloud(BaseModel):
+    items: List[TagCount]
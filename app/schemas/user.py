@@ -21,6 +21,19 @@ class UserUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class UserStatsResponse(BaseModel):
+    """Dashboard totals of an author; comment_count counts approved comments on their posts"""
+    user_id: int
+    post_count: int = 0
+    published_count: int = 0
+    draft_count: int = 0
+    total_views: int = 0
+    comment_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
 class UserResponse(UserBase):
     id: int
     is_active: bool
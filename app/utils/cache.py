@@ -0,0 +1,57 @@
+"""
+In-process TTL caches for read-heavy data
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_groups: Dict[str, List[TTLCache]] = {}
+
+
+def get_cache(group: str, ttl: float = 60.0, maxsize: int = 1024) -> TTLCache:
+    """Create a cache registered under ``group`` so it can be invalidated together"""
+    cache = TTLCache(ttl=ttl, maxsize=maxsize)
+    _groups.setdefault(group, []).append(cache)
+    return cache
+
+
+def invalidate_group(group: str) -> None:
+    """Clear every cache registered under ``group``"""
+    for cache in _groups.get(group, []):
+        cache.clear()
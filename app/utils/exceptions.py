@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import HTTPException, status
 
 class NotFoundException(HTTPException):
@@ -10,8 +11,33 @@ class BadRequestException(HTTPException):
 
 class UnauthorizedException(HTTPException):
     def __init__(self, detail: str = "Unauthorized"):
-        super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+        super().__init__(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=detail,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 class ForbiddenException(HTTPException):
     def __init__(self, detail: str = "Forbidden"):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+class ConflictException(HTTPException):
+    def __init__(self, detail: str = "Conflict", retry_after: Optional[int] = None):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)} if retry_after is not None else None,
+        )
+
+class UnprocessableEntityException(HTTPException):
+    def __init__(self, detail: str = "Unprocessable entity"):
+        # Literal code: the constant's name differs across Starlette versions
+        super().__init__(status_code=422, detail=detail)
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail: str = "Service temporarily overloaded", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
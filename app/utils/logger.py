@@ -0,0 +1,14 @@
+import logging
+
+LOG_FORMAT = "%(asctime)s %(levelname)-5.5s [%(name)s] %(message)s"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return an application logger namespaced under ``app``"""
+    logger = logging.getLogger(f"app.{name}")
+    if not logging.getLogger("app").handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.getLogger("app").addHandler(handler)
+        logging.getLogger("app").setLevel(logging.INFO)
+    return logger
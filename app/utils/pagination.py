@@ -0,0 +1,21 @@
+"""
+Opaque keyset cursors of the form (timestamp, id)
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+from app.utils.exceptions import BadRequestException
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(id)
+    except ValueError:
+        raise BadRequestException(detail="Invalid cursor")
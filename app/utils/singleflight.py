@@ -0,0 +1,63 @@
+"""
+Single-flight: concurrent identical calls share one in-flight execution
+"""
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+_FAILED = object()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key within one event loop.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight wait for its result instead of running their own.
+    Errors are not shared: if the leader fails or is cancelled, waiting
+    callers run the call themselves. At most ``max_keys`` keys are tracked
+    at once; past that, calls run uncoalesced.
+    """
+
+    def __init__(self, max_keys: int = 1024):
+        self.max_keys = max_keys
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.executed: Counter = Counter()
+        self.coalesced: Counter = Counter()
+        self.bypassed = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True when the result came from another caller"""
+        name = key[0] if isinstance(key, tuple) else key
+        future = self._in_flight.get(key)
+        if future is not None:
+            result = await asyncio.shield(future)
+            if result is not _FAILED:
+                self.coalesced[name] += 1
+                return result, True
+            return await call(), False
+
+        if len(self._in_flight) >= self.max_keys:
+            self.bypassed += 1
+            return await call(), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.executed[name] += 1
+        result = _FAILED
+        try:
+            result = await call()
+            return result, False
+        finally:
+            del self._in_flight[key]
+            future.set_result(result)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "max_keys": self.max_keys,
+            "bypassed": self.bypassed,
+            "executed": dict(self.executed),
+            "coalesced": dict(self.coalesced),
+            "coalesced_total": sum(self.coalesced.values()),
+        }
@@ -0,0 +1,72 @@
+"""Background workers started from the application lifespan"""
+from typing import List
+from app.config import settings
+from app.utils.logger import get_logger
+from app.workers.base import PeriodicWorker
+
+logger = get_logger("workers")
+
+
+def get_enabled_workers() -> List[PeriodicWorker]:
+    """Instantiate the workers enabled in settings"""
+    workers: List[PeriodicWorker] = []
+
+    if settings.SCHEDULED_PUBLISHING_ENABLED:
+        from app.workers.publisher import ScheduledPublisher
+        workers.append(ScheduledPublisher(
+            interval=settings.PUBLISHER_INTERVAL_SECONDS,
+            batch_size=settings.PUBLISHER_BATCH_SIZE,
+        ))
+
+    from app.workers.trending import ViewCountFlusher, TrendingAggregator
+    workers.append(ViewCountFlusher(
+        interval=settings.VIEW_FLUSH_INTERVAL_SECONDS,
+        batch_size=1,
+    ))
+    workers.append(TrendingAggregator(
+        interval=settings.TRENDING_REFRESH_SECONDS,
+        batch_size=1,
+    ))
+
+    if settings.OUTBOX_ENABLED:
+        from app.core.events import configure_sinks, get_sinks
+        from app.workers.outbox import OutboxDispatcher
+        configure_sinks()
+        if get_sinks():
+            workers.append(OutboxDispatcher(
+                interval=settings.OUTBOX_DISPATCH_INTERVAL_SECONDS,
+                batch_size=settings.OUTBOX_BATCH_SIZE,
+            ))
+        else:
+            # Dispatching with no sink would delete every event as delivered
+            logger.warning("OUTBOX_ENABLED is set but no sink is configured; events are kept undelivered")
+
+    if settings.COMMENT_ARCHIVE_ENABLED:
+        from app.workers.archiver import CommentArchiver
+        workers.append(CommentArchiver(
+            interval=settings.COMMENT_ARCHIVE_INTERVAL_SECONDS,
+            batch_size=settings.COMMENT_ARCHIVE_BATCH_SIZE,
+        ))
+
+    if settings.USER_STATS_RECONCILE_ENABLED:
+        from app.workers.stats import UserStatsReconciler
+        workers.append(UserStatsReconciler(
+            interval=settings.USER_STATS_RECONCILE_INTERVAL_SECONDS,
+            batch_size=settings.USER_STATS_RECONCILE_BATCH_SIZE,
+        ))
+
+    if settings.SOFT_DELETE_PURGE_ENABLED:
+        from app.workers.purger import SoftDeletePurger
+        workers.append(SoftDeletePurger(
+            interval=settings.SOFT_DELETE_PURGE_INTERVAL_SECONDS,
+            batch_size=settings.SOFT_DELETE_PURGE_BATCH_SIZE,
+        ))
+
+    if settings.IDEMPOTENCY_PURGE_ENABLED:
+        from app.workers.idempotency import IdempotencyKeyPurger
+        workers.append(IdempotencyKeyPurger(
+            interval=settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+            batch_size=settings.IDEMPOTENCY_PURGE_BATCH_SIZE,
+        ))
+
+    return workers
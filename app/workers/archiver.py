@@ -0,0 +1,37 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.config import settings
+from app.crud import comment_archive as crud_comment_archive
+from app.db.session import AsyncSessionLocal
+from app.workers.base import PeriodicWorker
+
+
+class CommentArchiver(PeriodicWorker):
+    """
+    Moves comment threads of inactive posts into comment_archives.
+
+    Each post is archived in its own transaction with a pause in between, so
+    the hot table is drained gradually without long-held locks.
+    """
+
+    name = "comment_archiver"
+
+    async def run_once(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(days=settings.COMMENT_ARCHIVE_AFTER_DAYS)
+        async with AsyncSessionLocal() as db:
+            post_ids = await crud_comment_archive.get_archivable_post_ids(
+                db=db, cutoff=cutoff, limit=self.batch_size
+            )
+            await db.rollback()
+            archived = 0
+            for post_id in post_ids:
+                if self._stopping.is_set():
+                    break
+                archived += await crud_comment_archive.archive_post(
+                    db=db, post_id=post_id, cutoff=cutoff,
+                    chunk_size=settings.COMMENT_ARCHIVE_CHUNK_SIZE,
+                )
+                await asyncio.sleep(settings.COMMENT_ARCHIVE_PAUSE_SECONDS)
+        if archived:
+            self.logger.info("Archived %d comments from %d posts", archived, len(post_ids))
+        return len(post_ids)
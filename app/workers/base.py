@@ -0,0 +1,51 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+from app.utils.logger import get_logger
+
+
+class PeriodicWorker(ABC):
+    """
+    Background task that calls ``run_once`` every ``interval`` seconds.
+
+    ``run_once`` returns the number of rows it processed; when that equals
+    ``batch_size`` the worker runs again immediately to drain the backlog.
+    """
+
+    name: str = "worker"
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.logger = get_logger(f"workers.{self.name}")
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @abstractmethod
+    async def run_once(self) -> int:
+        """Process one batch and return the number of rows handled"""
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            processed = 0
+            try:
+                processed = await self.run_once()
+            except Exception:
+                self.logger.exception("%s tick failed", self.name)
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
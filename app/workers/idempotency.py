@@ -0,0 +1,16 @@
+from datetime import datetime
+from app.crud import idempotency_key as crud_idempotency_key
+from app.db.session import AsyncSessionLocal
+from app.workers.base import PeriodicWorker
+
+
+class IdempotencyKeyPurger(PeriodicWorker):
+    """Deletes stored Idempotency-Key responses past their TTL"""
+
+    name = "idempotency_key_purger"
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            return await crud_idempotency_key.purge_expired(
+                db=db, now=datetime.utcnow(), limit=self.batch_size
+            )
@@ -0,0 +1,75 @@
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+from app.config import settings
+from app.core.events import dispatch_metrics, get_sinks
+from app.crud import outbox as crud_outbox
+from app.db.session import AsyncSessionLocal
+from app.models.outbox import OutboxEvent
+from app.workers.base import PeriodicWorker
+
+
+def serialize_event(event: OutboxEvent) -> dict:
+    return {
+        "id": event.id,
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": event.aggregate_id,
+        "event_type": event.event_type,
+        "payload": event.payload,
+        "created_at": event.created_at.isoformat(),
+        "attempt": event.attempts + 1,
+    }
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff capped at OUTBOX_RETRY_MAX_SECONDS"""
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** min(attempts, 20))
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+class OutboxDispatcher(PeriodicWorker):
+    """Delivers outbox events to every registered sink, at least once"""
+
+    name = "outbox_dispatcher"
+
+    async def run_once(self) -> int:
+        if not get_sinks():
+            # Nothing to deliver to; marking the batch dispatched would drop it
+            return 0
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            events = await crud_outbox.claim_batch(
+                db=db,
+                now=now,
+                lease=timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+                limit=self.batch_size,
+            )
+            if not events:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                batch = [serialize_event(event) for event in events]
+                for sink in get_sinks():
+                    await sink.send(batch)
+            except Exception as exc:
+                by_attempts: Dict[int, List[int]] = defaultdict(list)
+                for event in events:
+                    by_attempts[event.attempts].append(event.id)
+                for attempts, ids in by_attempts.items():
+                    await crud_outbox.mark_failed(
+                        db=db, ids=ids, error=repr(exc), retry_at=now + retry_delay(attempts)
+                    )
+                dispatch_metrics.record_batch(0, len(events), time.perf_counter() - started)
+                self.logger.warning("Outbox delivery of %d events failed: %r", len(events), exc)
+                return 0
+
+            await crud_outbox.mark_dispatched(db=db, ids=[event.id for event in events])
+            dispatch_metrics.record_batch(len(events), 0, time.perf_counter() - started)
+        return len(events)
+
+    async def stop(self) -> None:
+        await super().stop()
+        for sink in get_sinks():
+            await sink.close()
@@ -0,0 +1,22 @@
+from datetime import datetime
+from app.crud import post as crud_post
+from app.db.session import AsyncSessionLocal
+from app.utils.cache import invalidate_group
+from app.workers.base import PeriodicWorker
+
+
+class ScheduledPublisher(PeriodicWorker):
+    """Publishes posts whose ``scheduled_at`` has passed"""
+
+    name = "scheduled_publisher"
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            published_ids = await crud_post.publish_due(
+                db=db, now=datetime.utcnow(), limit=self.batch_size
+            )
+        if published_ids:
+            invalidate_group("posts")
+            invalidate_group("tags")
+            self.logger.info("Published %d scheduled posts", len(published_ids))
+        return len(published_ids)
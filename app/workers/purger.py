@@ -0,0 +1,32 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.config import settings
+from app.crud import comment as crud_comment, post as crud_post, user as crud_user
+from app.db.session import AsyncSessionLocal
+from app.workers.base import PeriodicWorker
+
+
+class SoftDeletePurger(PeriodicWorker):
+    """
+    Hard-deletes soft-deleted comments, then posts, then users.
+
+    Each batch of at most ``batch_size`` rows is its own transaction with a
+    pause in between. Posts and users are only purged once nothing references
+    them any more, so a prolific user drains over several batches.
+    """
+
+    name = "soft_delete_purger"
+
+    async def run_once(self) -> int:
+        before = datetime.utcnow() - timedelta(seconds=settings.SOFT_DELETE_PURGE_AFTER_SECONDS)
+        purged = 0
+        async with AsyncSessionLocal() as db:
+            for crud in (crud_comment, crud_post, crud_user):
+                if self._stopping.is_set():
+                    break
+                count = await crud.purge_deleted(db=db, before=before, limit=self.batch_size)
+                if count:
+                    self.logger.info("Purged %d soft-deleted %s rows", count, crud.model.__tablename__)
+                    await asyncio.sleep(settings.SOFT_DELETE_PURGE_PAUSE_SECONDS)
+                purged = max(purged, count)
+        return purged
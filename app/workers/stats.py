@@ -0,0 +1,31 @@
+from app.crud import user_stats as crud_user_stats
+from app.db.session import AsyncSessionLocal
+from app.workers.base import PeriodicWorker
+
+
+class UserStatsReconciler(PeriodicWorker):
+    """
+    Recomputes user_stats from posts, ``batch_size`` users per transaction.
+
+    A full batch makes the worker continue right away, so each interval sweeps
+    every user once; the cursor then wraps around for the next sweep.
+    """
+
+    name = "user_stats_reconciler"
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__(interval=interval, batch_size=batch_size)
+        self._after_user_id = 0
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            last_user_id, checked, fixed = await crud_user_stats.reconcile_range(
+                db=db, after_user_id=self._after_user_id, limit=self.batch_size
+            )
+        if fixed:
+            self.logger.warning(
+                "Corrected drifted stats of %d users after user id %d", fixed, self._after_user_id
+            )
+        # Past the last user: start the next sweep from the beginning
+        self._after_user_id = last_user_id or 0
+        return checked
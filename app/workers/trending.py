@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.trending import TRENDING_WINDOWS, trending_store, truncate_to_hour, view_buffer
+from app.crud import post_view as crud_post_view
+from app.db.session import AsyncSessionLocal
+from app.workers.base import PeriodicWorker
+
+
+class ViewCountFlusher(PeriodicWorker):
+    """Writes buffered post views to post_view_buckets and the authors' total_views once per tick"""
+
+    name = "view_count_flusher"
+
+    async def run_once(self) -> int:
+        counts = view_buffer.drain()
+        if not counts:
+            return 0
+        try:
+            async with AsyncSessionLocal() as db:
+                await crud_post_view.add_counts(db=db, counts=counts)
+        except Exception:
+            view_buffer.restore(counts)
+            raise
+        return 0
+
+    async def stop(self) -> None:
+        await super().stop()
+        # Don't lose views buffered since the last tick
+        await self.run_once()
+
+
+class TrendingAggregator(PeriodicWorker):
+    """Recomputes the top-K list for every trending window and prunes expired buckets"""
+
+    name = "trending_aggregator"
+
+    async def run_once(self) -> int:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            await refresh_trending(db, now)
+            await crud_post_view.prune(
+                db=db,
+                before=truncate_to_hour(now) - timedelta(days=settings.VIEW_BUCKET_RETENTION_DAYS),
+            )
+        return 0
+
+
+async def refresh_trending(db: AsyncSession, now: datetime) -> None:
+    """Recompute the stored top-K list for every window"""
+    for window, span in TRENDING_WINDOWS.items():
+        top = await crud_post_view.get_top_posts(
+            db=db, since=truncate_to_hour(now - span), limit=settings.TRENDING_TOP_K
+        )
+        trending_store.set(window, top)
@@ -0,0 +1,74 @@
+"""
+Event-loop latency during a burst of signups
+
+Runs a ticker that sleeps 1 ms in a loop and records how late each wake-up
+is, while N passwords are hashed either inline on the loop or through
+app.core.security's executor.
+
+    python -m benchmarks.bench_password_hashing --signups 50 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("DATABASE_URL_SYNC", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.config import settings
+from app.core import security
+
+
+async def measure_loop_lag(stop: asyncio.Event, samples: list) -> None:
+    interval = 0.001
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def hash_inline(password: str) -> str:
+    return security.hash_password_sync(password, settings.PASSWORD_BCRYPT_ROUNDS)
+
+
+async def run(mode: str, signups: int) -> None:
+    hasher = hash_inline if mode == "inline" else security.hash_password
+    samples: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_loop_lag(stop, samples))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(hasher(f"password-{i}") for i in range(signups)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if samples else 0.0
+    print(
+        f"{mode:>8}: {signups} signups in {elapsed:6.2f}s | {len(samples):5d} ticks, loop lag "
+        f"median {statistics.median(samples or [0]):7.2f} ms, "
+        f"p99 {p99:7.2f} ms, max {max(samples or [0]):7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--signups", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=settings.PASSWORD_BCRYPT_ROUNDS)
+    parser.add_argument("--executor", choices=["thread", "process"], default=settings.PASSWORD_HASH_EXECUTOR)
+    args = parser.parse_args()
+
+    settings.PASSWORD_BCRYPT_ROUNDS = args.rounds
+    settings.PASSWORD_HASH_EXECUTOR = args.executor
+
+    asyncio.run(run("inline", args.signups))
+    asyncio.run(run("executor", args.signups))
+    security.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Throughput and latency of the production entry point with 1 vs N workers
+
+Starts ``python main.py --workers W`` for each worker count, drives it with
+closed-loop HTTP clients spread over several load-generator processes (so
+the client side isn't the bottleneck), and reports requests/s and latency
+percentiles. The server reads its database and other settings from the
+environment as usual; rate limiting is switched off for the run. Without
+DATABASE_URL it runs offline against a temporary SQLite database seeded
+with --seed-posts published posts.
+
+    python -m benchmarks.bench_workers --workers 1 4 --path /api/v1/posts/ --duration 15
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def seed_sqlite(url: str, posts: int) -> None:
+    from sqlalchemy import insert
+    from app.db.base import Base
+    from app.db.session import create_db_engine
+    from app.models import Post, User
+
+    engine = create_db_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values(
+            id=1, email="bench@example.com", username="bench", hashed_password="x",
+        ))
+        await conn.execute(insert(Post), [
+            {
+                "title": f"Post {i}", "slug": f"post-{i}", "content": "Benchmark body " * 50,
+                "is_published": True, "author_id": 1,
+            }
+            for i in range(posts)
+        ])
+    await engine.dispose()
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+async def drive(url: str, connections: int, duration: float) -> tuple:
+    latencies: list = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(limits=limits, timeout=10.0) as client:
+        async def loop() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(loop() for _ in range(connections)))
+    return latencies, errors
+
+
+def load_process(url: str, connections: int, duration: float, queue) -> None:
+    queue.put(asyncio.run(drive(url, connections, duration)))
+
+
+def run(workers: int, args) -> None:
+    env = dict(os.environ, RATE_LIMIT_ENABLED="false", DEBUG="false")
+    server = subprocess.Popen(
+        [sys.executable, "main.py", "--workers", str(workers), "--port", str(args.port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base_url)
+        queue = multiprocessing.Queue()
+        per_process = max(args.connections // args.load_procs, 1)
+        procs = [
+            multiprocessing.Process(
+                target=load_process, args=(base_url + args.path, per_process, args.duration, queue)
+            )
+            for _ in range(args.load_procs)
+        ]
+        for proc in procs:
+            proc.start()
+        results = [queue.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = sum(result[1] for result in results)
+    if not latencies:
+        print(f"{workers:>3} workers: no requests completed")
+        return
+
+    def pct(p: float) -> float:
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+    print(
+        f"{workers:>3} workers: {len(latencies) / args.duration:8.0f} req/s | "
+        f"p50 {pct(0.50):6.1f} ms, p95 {pct(0.95):6.1f} ms, p99 {pct(0.99):6.1f} ms | "
+        f"{errors} errors"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--load-procs", type=int, default=max((os.cpu_count() or 2) // 2, 1))
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--seed-posts", type=int, default=50)
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="bench-workers-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        os.environ.setdefault("DATABASE_URL_SYNC", f"sqlite:///{path}")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        asyncio.run(seed_sqlite(os.environ["DATABASE_URL"], args.seed_posts))
+
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
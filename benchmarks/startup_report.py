@@ -0,0 +1,90 @@
+"""
+Where startup time goes
+
+Imports app.main in a fresh interpreter under ``python -X importtime`` and
+reports the wall time of the import (which includes app construction), the
+slowest modules by cumulative and self time, and self time per top-level
+package. With --openapi it also times the first OpenAPI schema build.
+
+    python -m benchmarks.startup_report --top 25
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+import app.main
+print(f"import {time.perf_counter() - start:.6f}")
+if "--openapi" in sys.argv:
+    start = time.perf_counter()
+    app.main.app.openapi()
+    print(f"openapi {time.perf_counter() - start:.6f}")
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        entries.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_child(openapi: bool) -> tuple:
+    env = dict(os.environ)
+    # Nothing connects during import; the URL only selects the dialect
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite:///startup.db")
+    env.setdefault("DATABASE_URL_SYNC", "sqlite:///startup.db")
+    env.setdefault("SECRET_KEY", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD] + (["--openapi"] if openapi else []),
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    timings = dict(line.split() for line in result.stdout.splitlines())
+    return {name: float(value) for name, value in timings.items()}, parse_importtime(result.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--openapi", action="store_true", help="also time the first OpenAPI schema build")
+    args = parser.parse_args()
+
+    timings, entries = run_child(args.openapi)
+    print(f"import app.main (incl. app construction): {timings['import'] * 1000:8.1f} ms")
+    if "openapi" in timings:
+        print(f"first OpenAPI schema build:               {timings['openapi'] * 1000:8.1f} ms")
+
+    print(f"\nTop {args.top} modules by cumulative time")
+    for entry in sorted(entries, key=lambda e: e.cumulative_us, reverse=True)[:args.top]:
+        print(f"{entry.cumulative_us / 1000:9.1f} ms  {entry.module}")
+
+    print(f"\nTop {args.top} modules by self time")
+    for entry in sorted(entries, key=lambda e: e.self_us, reverse=True)[:args.top]:
+        print(f"{entry.self_us / 1000:9.1f} ms  {entry.module}")
+
+    packages: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        packages[entry.module.split(".")[0]] += entry.self_us
+    print(f"\nTop {args.top} packages by total self time")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:9.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,54 @@
-from fastapi import FastAPI
+"""
+Production entry point
 
-app = FastAPI()
+    python main.py [--workers N] [--host HOST] [--port PORT]
 
-@app.get("/")
-async def root():
-    return {"message": "Hello World"}
\ No newline at end of file
+Runs app.main:app under uvicorn's process manager with one worker per
+usable CPU core (WEB_WORKERS overrides), uvloop and httptools when they are
+installed, and the keep-alive/backlog from settings. The resolved worker
+count is exported as WEB_WORKERS so every worker sizes its database pool
+from its share of DB_CONNECTION_BUDGET.
+"""
+import argparse
+import importlib.util
+import os
+import uvicorn
+from app.config import settings
+
+
+def usable_cpus() -> int:
+    # Honour CPU affinity (taskset, container cpusets) where the platform exposes it
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Blog CMS API")
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or usable_cpus())
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    args = parser.parse_args()
+
+    # Workers re-read settings from the environment on import
+    os.environ["WEB_WORKERS"] = str(args.workers)
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if installed("uvloop") else "asyncio",
+        http="httptools" if installed("httptools") else "h11",
+        backlog=settings.WEB_BACKLOG,
+        timeout_keep_alive=settings.WEB_KEEPALIVE_SECONDS,
+        access_log=settings.DEBUG,
+    )
+
+
+if __name__ == "__main__":
+    main()
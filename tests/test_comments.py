@@ -0,0 +1,178 @@
+"""
+Comment endpoint tests
+"""
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import comment_archive as crud_comment_archive
+from app.models import Comment, Post
+from tests.conftest import create_user_and_login
+
+
+async def create_post_with_comments(client: AsyncClient, count: int) -> tuple[int, list[int]]:
+    _, headers = await create_user_and_login(client, username="commenter")
+    response = await client.post(
+        "/api/v1/posts/",
+        json={"title": "Post", "slug": "post", "content": "Body", "is_published": True},
+        headers=headers
+    )
+    post_id = response.json()["id"]
+
+    comment_ids = []
+    for i in range(count):
+        response = await client.post(
+            "/api/v1/comments/",
+            json={"content": f"Comment {i}", "post_id": post_id},
+            headers=headers
+        )
+        comment_ids.append(response.json()["id"])
+    return post_id, comment_ids
+
+
+@pytest.mark.asyncio
+async def test_pending_comments_keyset_paging(client: AsyncClient, admin_headers: dict):
+    """Test that the moderation queue pages through every pending comment once"""
+    _, comment_ids = await create_post_with_comments(client, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/comments/pending", params=params, headers=admin_headers)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(comment["id"] for comment in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == comment_ids
+
+
+@pytest.mark.asyncio
+async def test_bulk_moderation_updates_post_counter(
+        client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+):
+    """Test bulk approve/reject and the approved comment counter"""
+    post_id, comment_ids = await create_post_with_comments(client, 4)
+    _, headers = await create_user_and_login(client, username="regular")
+
+    response = await client.post(
+        "/api/v1/comments/moderate", json={"ids": comment_ids, "action": "reject"}, headers=headers
+    )
+    assert response.status_code == 403
+    assert (await client.get("/api/v1/comments/pending")).status_code == 401
+
+    response = await client.post(
+        "/api/v1/comments/moderate",
+        json={"ids": comment_ids[:3], "action": "approve"},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["affected"] == 3
+
+    response = await client.post(
+        "/api/v1/comments/moderate",
+        json={"ids": [comment_ids[0], comment_ids[3]], "action": "reject"},
+        headers=admin_headers
+    )
+    assert response.json()["affected"] == 2
+
+    response = await client.get(f"/api/v1/posts/{post_id}")
+    assert response.json()["approved_comment_count"] == 2
+
+    response = await client.get("/api/v1/comments/pending", headers=admin_headers)
+    assert response.json()["items"] == []
+
+    # Rejected comments are soft-deleted, left for the purger
+    result = await db_session.execute(
+        select(Comment.id)
+        .where(Comment.deleted_at.is_not(None))
+        .execution_options(include_deleted=True)
+    )
+    assert sorted(result.scalars().all()) == [comment_ids[0], comment_ids[3]]
+
+
+@pytest.mark.asyncio
+async def test_inactive_threads_are_archived_and_read_transparently(
+        client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+):
+    """Test archiving an old thread, reading it back and restoring it on reply"""
+    post_id, comment_ids = await create_post_with_comments(client, 3)
+    await client.post(
+        "/api/v1/comments/moderate", json={"ids": comment_ids, "action": "approve"}, headers=admin_headers
+    )
+    _, headers = await create_user_and_login(client, username="replier")
+    response = await client.post(
+        "/api/v1/comments/",
+        json={"content": "Reply", "post_id": post_id, "parent_id": comment_ids[0]},
+        headers=headers
+    )
+    reply_id = response.json()["id"]
+    await client.post(
+        "/api/v1/comments/moderate", json={"ids": [reply_id], "action": "approve"}, headers=admin_headers
+    )
+
+    cutoff = datetime.utcnow()
+    old = cutoff - timedelta(days=365)
+    assert await crud_comment_archive.get_archivable_post_ids(db=db_session, cutoff=cutoff) == []
+    await db_session.execute(update(Post).where(Post.id == post_id).values(updated_at=old))
+    await db_session.execute(update(Comment).values(created_at=old))
+    await db_session.commit()
+    before = (await client.get(f"/api/v1/comments/post/{post_id}")).json()
+
+    assert await crud_comment_archive.get_archivable_post_ids(db=db_session, cutoff=cutoff) == [post_id]
+    assert await crud_comment_archive.archive_post(db=db_session, post_id=post_id, cutoff=cutoff, chunk_size=3) == 4
+    assert (await db_session.execute(select(func.count(Comment.id)))).scalar_one() == 0
+
+    response = await client.get(f"/api/v1/comments/post/{post_id}")
+    assert response.json() == before
+    response = await client.get(f"/api/v1/comments/post/{post_id}", params={"skip": 2, "limit": 1})
+    assert [comment["id"] for comment in response.json()] == [comment_ids[2]]
+    response = await client.get(f"/api/v1/comments/{reply_id}")
+    assert response.json()["parent_id"] == comment_ids[0]
+
+    response = await client.post(
+        "/api/v1/comments/",
+        json={"content": "Late reply", "post_id": post_id, "parent_id": reply_id},
+        headers=headers
+    )
+    assert response.status_code == 201
+    assert (await db_session.execute(select(func.count(Comment.id)))).scalar_one() == 5
+    response = await client.get(f"/api/v1/comments/post/{post_id}")
+    assert response.json()[:4] == before
+
+
+@pytest.mark.asyncio
+async def test_moderating_archived_comments_restores_their_thread(
+        client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+):
+    """Test that rejecting an archived comment restores its thread and moderates it"""
+    post_id, comment_ids = await create_post_with_comments(client, 3)
+    await client.post(
+        "/api/v1/comments/moderate", json={"ids": comment_ids, "action": "approve"}, headers=admin_headers
+    )
+    cutoff = datetime.utcnow()
+    old = cutoff - timedelta(days=365)
+    await db_session.execute(update(Post).where(Post.id == post_id).values(updated_at=old))
+    await db_session.execute(update(Comment).values(created_at=old))
+    await db_session.commit()
+    assert await crud_comment_archive.archive_post(db=db_session, post_id=post_id, cutoff=cutoff, chunk_size=2) == 3
+
+    response = await client.post(
+        "/api/v1/comments/moderate",
+        json={"ids": [comment_ids[2], 999999], "action": "reject"},
+        headers=admin_headers
+    )
+    assert response.json()["affected"] == 1
+
+    assert await crud_comment_archive.count_by_post(db=db_session, post_id=post_id) == 0
+    response = await client.get(f"/api/v1/posts/{post_id}")
+    assert response.json()["approved_comment_count"] == 2
+    response = await client.get(f"/api/v1/comments/post/{post_id}")
+    assert [comment["id"] for comment in response.json()] == comment_ids[:2]
@@ -0,0 +1,85 @@
+"""
+Sitemap and feed tests
+"""
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from tests.conftest import create_user_and_login
+
+
+async def create_posts(client: AsyncClient, headers: dict, slugs: list, published: bool = True) -> list:
+    ids = []
+    for slug in slugs:
+        response = await client.post(
+            "/api/v1/posts/",
+            json={"title": slug.title(), "slug": slug, "content": "Body", "excerpt": f"About {slug}",
+                  "is_published": published},
+            headers=headers
+        )
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_sitemap_and_feed_with_conditional_get(client: AsyncClient):
+    """Test that only published posts are listed and unchanged documents answer 304"""
+    _, headers = await create_user_and_login(client)
+    await create_posts(client, headers, ["first", "second"])
+    await create_posts(client, headers, ["draft"], published=False)
+
+    response = await client.get("/sitemap.xml")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/xml")
+    assert "<urlset" in response.text
+    assert f"{settings.SITE_URL}/posts/first</loc>" in response.text
+    assert "/posts/second</loc>" in response.text
+    assert "/posts/draft" not in response.text
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    # Served from cache the second time, byte for byte
+    cached = await client.get("/sitemap.xml")
+    assert cached.content == response.content
+    assert cached.headers["etag"] == etag
+
+    assert (await client.get("/sitemap.xml", headers={"If-None-Match": etag})).status_code == 304
+    assert (await client.get("/sitemap.xml", headers={"If-Modified-Since": last_modified})).status_code == 304
+
+    feed = await client.get("/feed.xml")
+    assert feed.status_code == 200
+    assert feed.headers["content-type"].startswith("application/rss+xml")
+    assert feed.text.count("<item>") == 2
+    assert "<description>About first</description>" in feed.text
+
+    # Reading a post is not a change; publishing one is
+    await client.get("/api/v1/posts/slug/first")
+    assert (await client.get("/sitemap.xml", headers={"If-None-Match": etag})).status_code == 304
+    await create_posts(client, headers, ["third"])
+    response = await client.get("/sitemap.xml", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "/posts/third</loc>" in response.text
+
+
+@pytest.mark.asyncio
+async def test_sitemap_index_shards(client: AsyncClient, monkeypatch):
+    """Test that past SITEMAP_SHARD_SIZE posts the sitemap becomes an index of id-range shards"""
+    monkeypatch.setattr(settings, "SITEMAP_SHARD_SIZE", 2)
+    monkeypatch.setattr(settings, "SITEMAP_BATCH_SIZE", 1)
+    _, headers = await create_user_and_login(client)
+    ids = await create_posts(client, headers, ["a", "b", "c", "d", "e"])
+
+    response = await client.get("/sitemap.xml")
+    assert response.status_code == 200
+    assert "<sitemapindex" in response.text
+    shards = sorted({post_id // 2 for post_id in ids})
+    assert response.text.count("<sitemap>") == len(shards)
+
+    listed = []
+    for shard in shards:
+        assert f"/sitemaps/posts-{shard}.xml</loc>" in response.text
+        shard_response = await client.get(f"/sitemaps/posts-{shard}.xml")
+        assert shard_response.status_code == 200
+        listed += [line for line in shard_response.text.splitlines() if "<loc>" in line]
+    assert len(listed) == 5
+
+    assert (await client.get(f"/sitemaps/posts-{shards[-1] + 1}.xml")).status_code == 404
@@ -0,0 +1,67 @@
+"""
+Outbox capture and dispatch tests
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import events
+from app.models.outbox import OutboxEvent
+from app.workers import outbox as outbox_worker
+
+
+@pytest.mark.asyncio
+async def test_changes_are_written_to_outbox_and_dispatched(
+        client: AsyncClient, db_session: AsyncSession, session_factory: async_sessionmaker, monkeypatch
+):
+    """Test that category writes produce outbox events that reach a sink exactly once"""
+    response = await client.post(
+        "/api/v1/categories/",
+        json={"name": "Tech", "slug": "tech"}
+    )
+    category_id = response.json()["id"]
+    await client.put(f"/api/v1/categories/{category_id}", json={"description": "All things tech"})
+    await client.delete(f"/api/v1/categories/{category_id}")
+
+    result = await db_session.execute(select(OutboxEvent).order_by(OutboxEvent.id))
+    assert [(e.aggregate_type, e.event_type) for e in result.scalars()] == [
+        ("category", "created"), ("category", "updated"), ("category", "deleted"),
+    ]
+
+    received = []
+
+    async def callback(batch):
+        received.extend(batch)
+
+    monkeypatch.setattr(events, "_sinks", [events.CallbackSink(callback)])
+    monkeypatch.setattr(outbox_worker, "AsyncSessionLocal", session_factory)
+    dispatcher = outbox_worker.OutboxDispatcher(interval=1.0, batch_size=10)
+
+    assert await dispatcher.run_once() == 3
+    assert [e["payload"] for e in received][1] == {"id": category_id, "fields": ["description"]}
+    assert await dispatcher.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_retried_with_backoff(
+        client: AsyncClient, db_session: AsyncSession, session_factory: async_sessionmaker, monkeypatch
+):
+    """Test that a failing sink leaves events in the outbox with a later retry time"""
+    await client.post("/api/v1/categories/", json={"name": "News", "slug": "news"})
+
+    async def failing(batch):
+        raise RuntimeError("sink down")
+
+    monkeypatch.setattr(events, "_sinks", [events.CallbackSink(failing)])
+    monkeypatch.setattr(outbox_worker, "AsyncSessionLocal", session_factory)
+    dispatcher = outbox_worker.OutboxDispatcher(interval=1.0, batch_size=10)
+
+    assert await dispatcher.run_once() == 0
+    assert await dispatcher.run_once() == 0  # not due again yet
+
+    db_session.expire_all()
+    event = (await db_session.execute(select(OutboxEvent))).scalar_one()
+    assert event.attempts == 1
+    assert "sink down" in event.last_error
+    assert event.next_attempt_at > event.created_at
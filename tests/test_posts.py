@@ -0,0 +1,282 @@
+"""
+Post endpoint tests
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.trending import view_buffer
+from app.crud import post as crud_post, post_view as crud_post_view
+from app.crud.base import read_flight
+from app.workers.trending import refresh_trending
+from tests.conftest import create_user_and_login
+
+
+@pytest.mark.asyncio
+async def test_scheduled_post_is_published_when_due(client: AsyncClient, db_session: AsyncSession):
+    """Test that a future scheduled_at keeps the post as a draft until the publisher runs"""
+    _, headers = await create_user_and_login(client)
+    scheduled_at = datetime.utcnow() + timedelta(hours=1)
+
+    response = await client.post(
+        "/api/v1/posts/",
+        json={
+            "title": "Scheduled",
+            "slug": "scheduled",
+            "content": "Coming soon",
+            "is_published": True,
+            "scheduled_at": scheduled_at.isoformat()
+        },
+        headers=headers
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["is_published"] is False
+    assert data["published_at"] is None
+
+    published_ids = await crud_post.publish_due(db=db_session, now=datetime.utcnow())
+    assert published_ids == []
+
+    published_ids = await crud_post.publish_due(db=db_session, now=scheduled_at + timedelta(seconds=1))
+    assert published_ids == [data["id"]]
+
+    response = await client.get("/api/v1/posts/slug/scheduled")
+    assert response.json()["is_published"] is True
+
+    # Unpublished after going live: the publisher must not bring it back
+    response = await client.put(f"/api/v1/posts/{data['id']}", json={"is_published": False}, headers=headers)
+    assert response.json()["is_published"] is False
+    assert await crud_post.publish_due(db=db_session, now=scheduled_at + timedelta(days=1)) == []
+
+    # A draft with a past scheduled_at was never asked to be published
+    response = await client.post(
+        "/api/v1/posts/",
+        json={"title": "Draft", "slug": "draft", "content": "Body", "scheduled_at": scheduled_at.isoformat()},
+        headers=headers
+    )
+    assert response.json()["is_published"] is False
+    assert await crud_post.publish_due(db=db_session, now=scheduled_at + timedelta(days=1)) == []
+
+
+@pytest.mark.asyncio
+async def test_trending_posts(client: AsyncClient, db_session: AsyncSession):
+    """Test that trending posts are ranked by buffered views"""
+    view_buffer.drain()
+    _, headers = await create_user_and_login(client)
+    for slug in ("quiet", "viral"):
+        await client.post(
+            "/api/v1/posts/",
+            json={"title": slug, "slug": slug, "content": "Body", "is_published": True},
+            headers=headers
+        )
+
+    await client.get("/api/v1/posts/slug/quiet")
+    for _ in range(3):
+        await client.get("/api/v1/posts/slug/viral")
+    # Views of posts deleted (or already purged) before the flush are dropped, not retried forever
+    response = await client.post(
+        "/api/v1/posts/", json={"title": "gone", "slug": "gone", "content": "Body", "is_published": True},
+        headers=headers
+    )
+    await client.get("/api/v1/posts/slug/gone")
+    await client.delete(f"/api/v1/posts/{response.json()['id']}", headers=headers)
+    view_buffer.record(999999)
+
+    await crud_post_view.add_counts(db=db_session, counts=view_buffer.drain())
+    await refresh_trending(db_session, datetime.utcnow())
+
+    response = await client.get("/api/v1/posts/trending?window=24h")
+    assert response.status_code == 200
+    assert [post["slug"] for post in response.json()] == ["viral", "quiet"]
+
+
+@pytest.mark.asyncio
+async def test_create_post_requires_authentication(client: AsyncClient):
+    """Test that posts are attributed to the authenticated user"""
+    response = await client.post(
+        "/api/v1/posts/",
+        json={"title": "Anonymous", "slug": "anonymous", "content": "Body"}
+    )
+    assert response.status_code == 401
+
+    user_id, headers = await create_user_and_login(client)
+    response = await client.post(
+        "/api/v1/posts/",
+        json={"title": "Mine", "slug": "mine", "content": "Body"},
+        headers=headers
+    )
+    assert response.status_code == 201
+    assert response.json()["author_id"] == user_id
+
+
+@pytest.mark.asyncio
+async def test_content_is_rendered_on_write(client: AsyncClient):
+    """Test that HTML, excerpt and reading stats are derived on create and update"""
+    _, headers = await create_user_and_login(client)
+    response = await client.post(
+        "/api/v1/posts/",
+        json={
+            "title": "Markdown",
+            "slug": "markdown",
+            "content": "# Hello\n\nSome **bold** text <script>alert(1)</script>"
+        },
+        headers=headers
+    )
+    data = response.json()
+    assert data["excerpt"] == "Hello Some bold text"
+    assert data["word_count"] == 4
+    assert data["reading_time_minutes"] == 1
+
+    response = await client.get(f"/api/v1/posts/{data['id']}?format=html")
+    html = response.json()["content"]
+    assert "<strong>bold</strong>" in html
+    assert "<script>" not in html
+
+    response = await client.put(
+        f"/api/v1/posts/{data['id']}",
+        json={"content": "Rewritten body"},
+        headers=headers
+    )
+    assert response.json()["excerpt"] == "Rewritten body"
+    assert response.json()["word_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_revisions_are_stored_and_reconstructed(client: AsyncClient, monkeypatch):
+    """Test that every saved version can be read back from snapshots and deltas"""
+    monkeypatch.setattr(settings, "POST_REVISION_SNAPSHOT_INTERVAL", 3)
+    _, headers = await create_user_and_login(client)
+    lines = [f"Paragraph {i}\n" for i in range(20)]
+    versions = [{"title": "Draft", "content": "".join(lines), "excerpt": "Intro"}]
+    response = await client.post(
+        "/api/v1/posts/",
+        json={**versions[0], "slug": "revised"},
+        headers=headers
+    )
+    post_id = response.json()["id"]
+
+    for i in range(6):
+        lines[i * 3] = f"Edited paragraph {i}\n"
+        change = {"content": "".join(lines)}
+        if i == 2:
+            change["title"] = "Final"
+        await client.put(f"/api/v1/posts/{post_id}", json=change, headers=headers)
+        versions.append({**versions[-1], **change})
+    # Saving without changing versioned fields doesn't add a revision
+    await client.put(f"/api/v1/posts/{post_id}", json={"is_published": True}, headers=headers)
+
+    response = await client.get(f"/api/v1/posts/{post_id}/revisions")
+    revisions = response.json()
+    assert [r["revision"] for r in revisions] == [7, 6, 5, 4, 3, 2, 1]
+    assert [r["revision"] for r in revisions if r["is_snapshot"]] == [7, 4, 1]
+
+    for revision, expected in enumerate(versions, start=1):
+        response = await client.get(f"/api/v1/posts/{post_id}/revisions/{revision}")
+        assert response.status_code == 200
+        data = response.json()
+        assert {field: data[field] for field in expected} == expected
+
+    response = await client.get(f"/api/v1/posts/{post_id}/revisions/8")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_tags_filtering_and_cloud(client: AsyncClient):
+    """Test tag assignment, AND/OR tag filters and tag cloud counts"""
+    _, headers = await create_user_and_login(client)
+    post_ids = {}
+    for slug, tags in [("a", ["Python", "Web"]), ("b", ["python"]), ("c", ["Web", "Rust"])]:
+        response = await client.post(
+            "/api/v1/posts/",
+            json={"title": slug, "slug": slug, "content": "Body", "is_published": True, "tags": tags},
+            headers=headers
+        )
+        post_ids[slug] = response.json()["id"]
+    assert [t["slug"] for t in response.json()["tags"]] == ["rust", "web"]
+
+    async def tagged(tags: str, match: str = "all") -> list:
+        response = await client.get("/api/v1/posts/", params={"tags": tags, "tags_match": match})
+        return sorted(post["slug"] for post in response.json())
+
+    assert await tagged("python,web") == ["a"]
+    assert await tagged("python,web", "any") == ["a", "b", "c"]
+    assert await tagged("python,unknown") == []
+    assert await tagged("python,unknown", "any") == ["a", "b"]
+
+    response = await client.get("/api/v1/tags/cloud")
+    assert [(t["slug"], t["post_count"]) for t in response.json()["items"]] == [
+        ("python", 2), ("web", 2), ("rust", 1),
+    ]
+
+    response = await client.put(f"/api/v1/posts/{post_ids['c']}", json={"tags": ["python"]}, headers=headers)
+    assert [t["slug"] for t in response.json()["tags"]] == ["python"]
+    assert await tagged("web,rust", "any") == ["a"]
+    response = await client.get("/api/v1/tags/cloud")
+    assert response.json()["items"][0] == {
+        "id": response.json()["items"][0]["id"], "name": "Python", "slug": "python", "post_count": 3,
+    }
+
+    # Unpublishing and deleting posts show up at once, not after the cache TTL
+    await client.put(f"/api/v1/posts/{post_ids['a']}", json={"is_published": False}, headers=headers)
+    await client.delete(f"/api/v1/posts/{post_ids['b']}", headers=headers)
+    response = await client.get("/api/v1/tags/cloud")
+    assert [(t["slug"], t["post_count"]) for t in response.json()["items"]] == [("python", 1)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_are_coalesced(client: AsyncClient, session_factory: async_sessionmaker):
+    """Test that concurrent get_by_slug calls share one query and each get an object in its own session"""
+    _, headers = await create_user_and_login(client)
+    await client.post(
+        "/api/v1/posts/",
+        json={"title": "Viral", "slug": "viral-post", "content": "Body", "is_published": True},
+        headers=headers
+    )
+    key = "CRUDPost.get_by_slug"
+    executed, coalesced = read_flight.executed[key], read_flight.coalesced[key]
+
+    sessions = [session_factory() for _ in range(5)]
+    posts = await asyncio.gather(*(crud_post.get_by_slug(db=db, slug="viral-post") for db in sessions))
+
+    assert read_flight.executed[key] - executed == 1
+    assert read_flight.coalesced[key] - coalesced == 4
+    assert len({id(post) for post in posts}) == 5
+    for db, post in zip(sessions, posts):
+        assert post in db
+        assert post.slug == "viral-post" and post.author.username == "author"
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_first_response(client: AsyncClient, db_session: AsyncSession):
+    """Test that retries and concurrent duplicates with one Idempotency-Key create a single post"""
+    _, headers = await create_user_and_login(client)
+    body = {"title": "Once", "slug": "once", "content": "Body", "is_published": True}
+    retry_headers = {**headers, "Idempotency-Key": "create-once"}
+
+    first = await client.post("/api/v1/posts/", json=body, headers=retry_headers)
+    assert first.status_code == 201
+    assert first.headers["idempotent-replayed"] == "false"
+
+    retry = await client.post("/api/v1/posts/", json=body, headers=retry_headers)
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+    response = await client.post("/api/v1/posts/", json={**body, "title": "Other"}, headers=retry_headers)
+    assert response.status_code == 422
+
+    # Without a key the duplicate slug is rejected as before
+    assert (await client.post("/api/v1/posts/", json=body, headers=headers)).status_code == 400
+
+    concurrent_headers = {**headers, "Idempotency-Key": "create-twice"}
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/posts/", json={**body, "slug": "twice"}, headers=concurrent_headers)
+        for _ in range(3)
+    ))
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sorted(response.headers["idempotent-replayed"] for response in responses) == ["false", "true", "true"]
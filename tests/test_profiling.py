@@ -0,0 +1,55 @@
+"""
+Request profiling middleware tests
+"""
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from app.core.profiling import ProfileStore
+from app.middleware.profiling import ProfilingMiddleware
+
+
+def build_app(store: ProfileStore, sample_rate: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return sorted(range(1000), reverse=True)[:3]
+
+    app.add_middleware(ProfilingMiddleware, store=store, sample_rate=sample_rate)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_are_profiled_into_bounded_store(tmp_path):
+    """Test that sampled requests are saved and only the newest profiles are kept"""
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    transport = ASGITransport(app=build_app(store, sample_rate=1.0))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = []
+        for _ in range(3):
+            response = await client.get("/items")
+            assert response.status_code == 200
+            ids.append(response.headers["x-profile-id"])
+
+    profiles = store.list()
+    assert [profile["id"] for profile in profiles] == ids[:0:-1]
+    assert profiles[0]["path"] == "/items"
+    assert profiles[0]["status"] == 200
+    assert profiles[0]["trigger"] == "sample"
+    assert store.file_path(ids[0], "txt") is None
+    with open(store.file_path(ids[2], "txt"), encoding="utf-8") as f:
+        assert f.read()
+    assert store.file_path("../secret", "txt") is None
+
+
+@pytest.mark.asyncio
+async def test_profile_header_ignored_without_superuser(tmp_path):
+    """Test that anonymous requests cannot ask for a profile"""
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    transport = ASGITransport(app=build_app(store, sample_rate=0.0))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert store.list() == []
@@ -0,0 +1,81 @@
+"""
+Rate limiting and load shedding tests
+"""
+import asyncio
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from app.db.limiter import DBConcurrencyLimiter
+from app.middleware.rate_limit import InMemoryBackend, RateLimitMiddleware, RouteGroup
+from app.utils.exceptions import ServiceUnavailableException
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return []
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=InMemoryBackend(),
+        groups={
+            "auth": RouteGroup("auth", rate=1.0, burst=1),
+            "write": RouteGroup("write", rate=1.0, burst=1),
+            "read": RouteGroup("read", rate=0.01, burst=3),
+        },
+    )
+    return app
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_returns_429_with_retry_after():
+    """Test that a client is throttled once its bucket is empty"""
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(3):
+            response = await client.get("/items")
+            assert response.status_code == 200
+
+        response = await client.get("/items")
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_deep_offsets_cost_more():
+    """Test that a deep offset page consumes more than one token"""
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items", params={"skip": 2000})
+        assert response.status_code == 200
+
+        response = await client.get("/items")
+        assert response.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_db_limiter_sheds_when_queue_is_full():
+    """Test that work beyond the concurrency limit and queue is rejected with 503"""
+    limiter = DBConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=1.0)
+    release = asyncio.Event()
+
+    async def hold_slot():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold_slot())
+    waiter = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableException) as exc_info:
+        async with limiter.slot():
+            pass
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert limiter.rejected == 1
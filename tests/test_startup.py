@@ -0,0 +1,42 @@
+"""
+Startup time regression test
+"""
+import os
+import subprocess
+import sys
+
+from app.config import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import time
+start = time.perf_counter()
+import app.main
+print(time.perf_counter() - start)
+"""
+
+
+def measure_startup() -> float:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite:///startup.db")
+    env.setdefault("DATABASE_URL_SYNC", "sqlite:///startup.db")
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
+
+
+def test_app_import_stays_within_startup_budget():
+    """Test that importing and constructing the app fits STARTUP_BUDGET_SECONDS (best of 3 cold starts)"""
+    elapsed = min(measure_startup() for _ in range(3))
+    assert elapsed <= settings.STARTUP_BUDGET_SECONDS, (
+        f"app.main took {elapsed:.2f}s to import, budget is {settings.STARTUP_BUDGET_SECONDS:.2f}s; "
+        f"run python -m benchmarks.startup_report to see where the time goes"
+    )
+
+
+def test_openapi_is_not_built_at_startup():
+    """Test that the schema is only generated on demand"""
+    from app.main import app
+    assert app.openapi_schema is None
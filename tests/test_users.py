@@ -3,6 +3,18 @@ User endpoint tests
 """
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.trending import view_buffer
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from app.crud import (
+    comment as crud_comment, comment_archive as crud_comment_archive, post as crud_post,
+    post_view as crud_post_view, user as crud_user, user_stats as crud_user_stats,
+)
+from app.models import Comment, Post, User, UserStats
+from tests.conftest import create_user_and_login
 
 
 @pytest.mark.asyncio
@@ -61,4 +73,192 @@ async def test_duplicate_email(client: AsyncClient):
     # Try to create with same email
     user_data["username"] = "user2"
     response = await client.post("/api/v1/users/", json=user_data)
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_password_is_hashed_and_rehashed_on_login(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    """Test that passwords are stored hashed and upgraded when the cost changes"""
+    response = await client.post(
+        "/api/v1/users/",
+        json={"email": "hash@example.com", "username": "hashuser", "password": "password123"}
+    )
+    user = await crud_user.get(db=db_session, id=response.json()["id"])
+    assert user.hashed_password != "password123"
+    old_hash = user.hashed_password
+
+    assert await crud_user.authenticate(db=db_session, username="hashuser", password="wrong-password") is None
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", settings.PASSWORD_BCRYPT_ROUNDS + 1)
+    user = await crud_user.authenticate(db=db_session, username="hash@example.com", password="password123")
+    assert user is not None
+    assert user.hashed_password != old_hash
+
+
+@pytest.mark.asyncio
+async def test_user_stats_are_maintained_and_reconciled(
+        client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+):
+    """Test that author stats follow post/comment writes and that the reconciler fixes drift"""
+    user_id, headers = await create_user_and_login(client)
+    response = await client.get(f"/api/v1/users/{user_id}/stats")
+    assert response.json()["post_count"] == 0
+
+    post_ids = []
+    for slug, published in (("one", True), ("two", True), ("draft", False)):
+        response = await client.post(
+            "/api/v1/posts/",
+            json={"title": slug, "slug": slug, "content": "Body", "is_published": published},
+            headers=headers
+        )
+        post_ids.append(response.json()["id"])
+    view_buffer.drain()
+    await client.get("/api/v1/posts/slug/one")
+    await client.get("/api/v1/posts/slug/one")
+    await crud_post_view.add_counts(db=db_session, counts=view_buffer.drain())
+    response = await client.post(
+        "/api/v1/comments/", json={"content": "Nice", "post_id": post_ids[0]}, headers=headers
+    )
+    await client.post(
+        "/api/v1/comments/moderate", json={"ids": [response.json()["id"]], "action": "approve"}, headers=admin_headers
+    )
+    await client.put(f"/api/v1/posts/{post_ids[2]}", json={"is_published": True})
+    await client.delete(f"/api/v1/posts/{post_ids[1]}")
+
+    expected = {
+        "user_id": user_id, "post_count": 2, "published_count": 2, "draft_count": 0,
+        "total_views": 2, "comment_count": 1,
+    }
+    response = await client.get(f"/api/v1/users/{user_id}/stats")
+    assert response.status_code == 200
+    assert response.json() == expected
+
+    stats = await db_session.get(UserStats, user_id)
+    stats.total_views = 1000
+    stats.post_count = 7
+    await db_session.commit()
+    last_user_id, checked, fixed = await crud_user_stats.reconcile_range(db=db_session)
+    # The admin is checked too, and had no drift
+    assert (last_user_id, checked, fixed) == (user_id, 2, 1)
+    await db_session.refresh(stats)
+    response = await client.get(f"/api/v1/users/{user_id}/stats")
+    assert response.json() == expected
+
+    assert (await client.get("/api/v1/users/999999/stats")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_user_is_soft_and_purged_in_batches(
+        client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+):
+    """Test that a deleted user's posts and comments vanish from reads at once and are purged later"""
+    user_id, headers = await create_user_and_login(client, username="leaving")
+    other_id, other_headers = await create_user_and_login(client, username="staying")
+    own_post = (await client.post(
+        "/api/v1/posts/", json={"title": "Own", "slug": "own", "content": "Body", "is_published": True},
+        headers=headers
+    )).json()["id"]
+    other_post = (await client.post(
+        "/api/v1/posts/", json={"title": "Other", "slug": "other", "content": "Body", "is_published": True},
+        headers=other_headers
+    )).json()["id"]
+    comment_ids = []
+    for post_id, comment_headers in ((own_post, other_headers), (other_post, headers), (other_post, headers)):
+        response = await client.post(
+            "/api/v1/comments/", json={"content": "Hi", "post_id": post_id}, headers=comment_headers
+        )
+        comment_ids.append(response.json()["id"])
+    await client.post(
+        "/api/v1/comments/moderate", json={"ids": comment_ids, "action": "approve"}, headers=admin_headers
+    )
+
+    assert (await client.delete(f"/api/v1/users/{user_id}")).status_code == 204
+
+    assert (await client.get(f"/api/v1/users/{user_id}")).status_code == 404
+    assert (await client.get(f"/api/v1/posts/{own_post}")).status_code == 404
+    assert [post["id"] for post in (await client.get("/api/v1/posts/")).json()] == [other_post]
+    assert (await client.get(f"/api/v1/comments/post/{other_post}")).json() == []
+    assert (await client.get(f"/api/v1/posts/{other_post}")).json()["approved_comment_count"] == 0
+    assert (await client.get(f"/api/v1/users/{other_id}/stats")).json()["comment_count"] == 0
+    # The username stays taken until the row is purged
+    response = await client.post(
+        "/api/v1/users/",
+        json={"email": "new@example.com", "username": "leaving", "password": "password123"}
+    )
+    assert response.status_code == 400
+
+    before = datetime.utcnow() + timedelta(seconds=1)
+    assert await crud_user.purge_deleted(db=db_session, before=before) == 0
+    assert await crud_post.purge_deleted(db=db_session, before=before) == 0
+    assert await crud_comment.purge_deleted(db=db_session, before=before, limit=2) == 2
+    assert await crud_comment.purge_deleted(db=db_session, before=before, limit=2) == 1
+    assert await crud_post.purge_deleted(db=db_session, before=before) == 1
+    assert await crud_user.purge_deleted(db=db_session, before=before) == 1
+
+    remaining = await db_session.execute(
+        select(User.id).where(User.id == user_id).execution_options(include_deleted=True)
+    )
+    assert remaining.first() is None
+    remaining = await db_session.execute(select(Post.id, Comment.id).execution_options(include_deleted=True)
+                                         .join(Comment, Comment.post_id == Post.id, isouter=True))
+    assert remaining.all() == [(other_post, None)]
+
+
+@pytest.mark.asyncio
+async def test_deleted_users_archived_comments_are_hidden_and_purged(
+        client: AsyncClient, admin_headers: dict, db_session: AsyncSession
+):
+    """Test that archived comments follow their author's and post's deletion and restores still work"""
+    author_id, headers = await create_user_and_login(client, username="author")
+    leaving_id, leaving_headers = await create_user_and_login(client, username="leaving")
+    post_ids = []
+    for slug in ("kept", "dropped"):
+        response = await client.post(
+            "/api/v1/posts/", json={"title": slug, "slug": slug, "content": "Body", "is_published": True},
+            headers=headers
+        )
+        post_ids.append(response.json()["id"])
+    kept, dropped = post_ids
+    parent_id = (await client.post(
+        "/api/v1/comments/", json={"content": "Hi", "post_id": kept}, headers=leaving_headers
+    )).json()["id"]
+    reply_id = (await client.post(
+        "/api/v1/comments/", json={"content": "Hello", "post_id": kept, "parent_id": parent_id}, headers=headers
+    )).json()["id"]
+    own_id = (await client.post(
+        "/api/v1/comments/", json={"content": "Mine", "post_id": dropped}, headers=headers
+    )).json()["id"]
+    await client.post(
+        "/api/v1/comments/moderate",
+        json={"ids": [parent_id, reply_id, own_id], "action": "approve"},
+        headers=admin_headers
+    )
+
+    cutoff = datetime.utcnow()
+    old = cutoff - timedelta(days=365)
+    await db_session.execute(update(Post).values(updated_at=old))
+    await db_session.execute(update(Comment).values(created_at=old))
+    await db_session.commit()
+    for post_id in post_ids:
+        await crud_comment_archive.archive_post(db=db_session, post_id=post_id, cutoff=cutoff)
+
+    assert (await client.delete(f"/api/v1/users/{leaving_id}")).status_code == 204
+    assert [c["id"] for c in (await client.get(f"/api/v1/comments/post/{kept}")).json()] == [reply_id]
+    assert (await client.get(f"/api/v1/comments/{parent_id}")).status_code == 404
+    assert (await client.get(f"/api/v1/posts/{kept}")).json()["approved_comment_count"] == 1
+
+    # A deleted post's archived thread is neither served nor restored
+    assert (await client.delete(f"/api/v1/posts/{dropped}", headers=headers)).status_code == 204
+    assert (await client.put(f"/api/v1/comments/{own_id}", json={"content": "Edited"})).status_code == 404
+    assert (await client.get(f"/api/v1/comments/post/{dropped}")).json() == []
+
+    before = datetime.utcnow() + timedelta(seconds=1)
+    assert await crud_comment.purge_deleted(db=db_session, before=before) == 0
+    assert await crud_user.purge_deleted(db=db_session, before=before) == 1
+
+    response = await client.post(
+        "/api/v1/comments/", json={"content": "Late", "post_id": kept, "parent_id": reply_id}, headers=headers
+    )
+    assert response.status_code == 201
+    comments = (await client.get(f"/api/v1/comments/post/{kept}")).json()
+    assert [(c["id"], c["parent_id"]) for c in comments] == [(reply_id, None), (response.json()["id"], reply_id)]